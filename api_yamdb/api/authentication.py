@@ -0,0 +1,70 @@
+"""Аутентификация по JWT без обращения к БД."""
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.models import User
+
+USER_CLAIMS = ('username', 'role', 'is_superuser')
+
+
+class UserClaimsAccessToken(AccessToken):
+    """Токен доступа с данными пользователя, нужными для проверки прав."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """Аутентификация, собирающая пользователя из данных токена.
+
+    Пользователь загружается из БД для изменяющих запросов, эндпоинтов из
+    настройки JWT_FULL_USER_ENDPOINTS и токенов без данных пользователя.
+    Поэтому запись всегда проверяет is_active и текущую роль, а чтение
+    до истечения токена опирается на роль, записанную в нём.
+    """
+
+    def authenticate(self, request):
+        self.view = request.parser_context.get('view')
+        self.method = request.method
+        return super().authenticate(request)
+
+    def needs_full_user(self, validated_token):
+        """Проверка необходимости загрузить пользователя из БД."""
+
+        if self.method not in SAFE_METHODS:
+            return True
+        if any(claim not in validated_token for claim in USER_CLAIMS):
+            return True
+        if self.view is None:
+            return False
+        view_name = type(self.view).__name__
+        action = getattr(self.view, 'action', None)
+        endpoints = settings.JWT_FULL_USER_ENDPOINTS
+        return view_name in endpoints or f'{view_name}.{action}' in endpoints
+
+    def get_user(self, validated_token):
+        if self.needs_full_user(validated_token):
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Токен не содержит идентификатор пользователя.'
+            )
+        user = User(
+            id=user_id,
+            username=validated_token['username'],
+            role=validated_token['role'],
+            is_superuser=validated_token['is_superuser'],
+        )
+        user._state.adding = False
+        return user
@@ -0,0 +1,154 @@
+"""Пакетная запись произведений."""
+
+from django.db import connection, transaction
+
+from reviews import leaderboard
+from reviews.models import Category, Genre, Title, TitleScoreHistogram
+
+from .cache import invalidate_resources
+from .pagination import invalidate_counts
+from .serializers import TitleBulkItemSerializer, TitleReadSerializer
+
+TITLE_FIELDS = ('name', 'year', 'category', 'description')
+
+
+def validate_items(items):
+    """Проверка элементов пакета без обращения к БД."""
+
+    validated, errors = {}, {}
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors[index] = {'non_field_errors': ['Ожидался объект.']}
+            continue
+        serializer = TitleBulkItemSerializer(data=item, partial='id' in item)
+        if serializer.is_valid():
+            validated[index] = serializer.validated_data
+        else:
+            errors[index] = serializer.errors
+    return validated, errors
+
+
+def resolve_relations(validated, errors):
+    """Поиск категорий, жанров и изменяемых произведений пакета.
+
+    На каждую модель выполняется не больше одного запроса.
+    """
+
+    category_slugs = {data['category'] for data in validated.values()
+                      if 'category' in data}
+    genre_slugs = {slug for data in validated.values()
+                   for slug in data.get('genre', ())}
+    title_ids = {data['id'] for data in validated.values() if 'id' in data}
+    categories = Category.objects.in_bulk(category_slugs, field_name='slug')
+    genres = Genre.objects.in_bulk(genre_slugs, field_name='slug')
+    titles = Title.objects.in_bulk(title_ids)
+    seen_ids = set()
+    for index, data in sorted(validated.items()):
+        item_errors = {}
+        if 'id' in data and data['id'] not in titles:
+            item_errors['id'] = ['Произведение не найдено.']
+        elif 'id' in data and data['id'] in seen_ids:
+            item_errors['id'] = ['Произведение уже изменяется в этом пакете.']
+        if 'id' in data:
+            seen_ids.add(data['id'])
+        if 'category' in data and data['category'] not in categories:
+            item_errors['category'] = [
+                f'Категория {data["category"]} не найдена.'
+            ]
+        missing = [slug for slug in data.get('genre', ())
+                   if slug not in genres]
+        if missing:
+            item_errors['genre'] = [
+                f'Жанр {slug} не найден.' for slug in missing
+            ]
+        if item_errors:
+            errors[index] = item_errors
+            del validated[index]
+    return categories, genres, titles
+
+
+def set_inserted_ids(titles):
+    """Id произведений, вставленных bulk_create без RETURNING, на SQLite.
+
+    Транзакция держит единственную блокировку записи SQLite, а столбец id
+    объявлен AUTOINCREMENT, поэтому вставленные строки получают подряд
+    идущие id больше всех существующих.
+    """
+
+    ids = Title.objects.order_by('-pk').values_list(
+        'pk', flat=True
+    )[:len(titles)]
+    for title, pk in zip(titles, reversed(ids)):
+        title.pk = pk
+        title._state.adding = False
+        title._state.db = connection.alias
+
+
+def write_titles(items):
+    """Создание и изменение произведений пакетом.
+
+    Элементы с полем ``id`` изменяют существующие произведения, остальные
+    создают новые. Ошибки возвращаются по каждому элементу и не прерывают
+    запись остальных.
+    """
+
+    validated, errors = validate_items(items)
+    categories, genres, titles = resolve_relations(validated, errors)
+    created, updated, genre_links = [], [], {}
+    for index, data in validated.items():
+        title = titles[data['id']] if 'id' in data else Title()
+        for field in TITLE_FIELDS:
+            if field == 'category' and 'category' in data:
+                title.category = categories[data['category']]
+            elif field in data:
+                setattr(title, field, data[field])
+        (updated if 'id' in data else created).append((index, title))
+        if 'genre' in data:
+            genre_links[index] = [genres[slug] for slug in data['genre']]
+
+    scopes = leaderboard.get_title_scopes(
+        [title.pk for _, title in updated]
+    )
+    with transaction.atomic():
+        new_titles = [title for _, title in created]
+        if (connection.features.can_return_rows_from_bulk_insert
+                or connection.vendor == 'sqlite'):
+            Title.objects.bulk_create(new_titles)
+            if new_titles and new_titles[0].pk is None:
+                set_inserted_ids(new_titles)
+            TitleScoreHistogram.objects.bulk_create(
+                TitleScoreHistogram(title=title) for title in new_titles
+            )
+        else:
+            for title in new_titles:
+                title.save()
+        Title.objects.bulk_update(
+            [title for _, title in updated], TITLE_FIELDS
+        )
+        written = dict(created + updated)
+        Through = Title.genre.through
+        Through.objects.filter(title_id__in=[
+            written[index].pk for index, _ in updated if index in genre_links
+        ]).delete()
+        Through.objects.bulk_create(
+            Through(title_id=written[index].pk, genre_id=genre.pk)
+            for index, linked in genre_links.items()
+            for genre in linked
+        )
+        Title.objects.filter(
+            pk__in=[title.pk for _, title in updated]
+        ).touch()
+        leaderboard.rebuild_scopes(scopes | leaderboard.get_title_scopes(
+            [title.pk for _, title in updated]
+        ))
+    invalidate_counts(Title._meta.db_table, Through._meta.db_table)
+    invalidate_resources('titles')
+
+    saved = Title.objects.select_related('category').prefetch_related(
+        'genre'
+    ).in_bulk([title.pk for title in written.values()])
+    return [
+        {'errors': errors[index]} if index in errors
+        else TitleReadSerializer(saved[written[index].pk]).data
+        for index in range(len(items))
+    ]
@@ -0,0 +1,95 @@
+"""Кеширование ответов публичных эндпоинтов."""
+
+import time
+from hashlib import md5
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+
+RESPONSE_GENERATION_KEY = 'response-generation:{resource}'
+RESPONSE_KEY = 'response:{resource}:{generation}:{signature}'
+RESPONSE_STATS_KEY = 'response-stats:{resource}:{event}'
+RESPONSE_STATS_EVENTS = ('hit', 'miss')
+
+# Ресурсы, ответы которых зависят от данных модели.
+MODEL_RESOURCES = {
+    'reviews.category': ('categories', 'titles'),
+    'reviews.genre': ('genres', 'titles'),
+    'reviews.title': ('titles',),
+    'reviews.title_genre': ('titles',),
+    'reviews.review': ('titles',),
+}
+
+
+def get_generation(resource):
+    """Текущее поколение закешированных ответов ресурса."""
+
+    key = RESPONSE_GENERATION_KEY.format(resource=resource)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def invalidate_resources(*resources):
+    """Сброс закешированных ответов ресурсов."""
+
+    for resource in resources:
+        key = RESPONSE_GENERATION_KEY.format(resource=resource)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def invalidate_model_resources(model):
+    """Сброс ответов ресурсов, зависящих от модели."""
+
+    invalidate_resources(*MODEL_RESOURCES.get(model._meta.label_lower, ()))
+
+
+def get_response_key(resource, request):
+    """Ключ ответа по пути и отсортированным параметрам запроса."""
+
+    query = urlencode(sorted(
+        (key, value) for key, values in request.query_params.lists()
+        for value in values
+    ))
+    signature = md5(f'{request.path}?{query}'.encode()).hexdigest()
+    return RESPONSE_KEY.format(
+        resource=resource,
+        generation=get_generation(resource),
+        signature=signature,
+    )
+
+
+def count_event(resource, event):
+    """Учёт попадания или промаха кеша."""
+
+    key = RESPONSE_STATS_KEY.format(resource=resource, event=event)
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def get_stats():
+    """Счётчики попаданий и промахов кеша по ресурсам."""
+
+    resources = sorted({
+        resource for resources in MODEL_RESOURCES.values()
+        for resource in resources
+    })
+    keys = {
+        RESPONSE_STATS_KEY.format(resource=resource, event=event):
+            (resource, event)
+        for resource in resources for event in RESPONSE_STATS_EVENTS
+    }
+    values = cache.get_many(keys)
+    stats = {resource: dict.fromkeys(RESPONSE_STATS_EVENTS, 0)
+             for resource in resources}
+    for key, (resource, event) in keys.items():
+        stats[resource][event] = values.get(key, 0)
+    return stats
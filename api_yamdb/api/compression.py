@@ -0,0 +1,92 @@
+"""Сжатие ответов gzip и brotli с выбором по Accept-Encoding."""
+
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+class GzipCompressor:
+    """Потоковый gzip поверх zlib."""
+
+    def __init__(self):
+        self.compressor = zlib.compressobj(
+            GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+        )
+
+    def process(self, data):
+        return self.compressor.compress(data)
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+class BrotliCompressor:
+    """Потоковый brotli; доступен при установленном пакете brotli."""
+
+    def __init__(self):
+        self.compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def process(self, data):
+        return self.compressor.process(data)
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+# Кодировки в порядке предпочтения при равном весе в Accept-Encoding.
+COMPRESSORS = {'gzip': GzipCompressor}
+if brotli is not None:
+    COMPRESSORS = {'br': BrotliCompressor, **COMPRESSORS}
+
+
+def parse_accept_encoding(header):
+    """Словарь кодировка -> вес из заголовка Accept-Encoding."""
+
+    weights = {}
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        if not coding:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip().lower()] = weight
+    return weights
+
+
+def choose_encoding(header):
+    """Наиболее предпочтительная из поддерживаемых кодировок или None."""
+
+    weights = parse_accept_encoding(header)
+    best, best_weight = None, 0.0
+    for coding in COMPRESSORS:
+        weight = weights.get(coding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def compress(coding, data):
+    compressor = COMPRESSORS[coding]()
+    return compressor.process(data) + compressor.finish()
+
+
+def compress_stream(coding, chunks):
+    """Сжатие последовательности байтовых строк без накопления в памяти."""
+
+    compressor = COMPRESSORS[coding]()
+    for chunk in chunks:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
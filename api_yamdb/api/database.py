@@ -0,0 +1,98 @@
+"""Настройка соединений с базой данных и маршрутизация чтения."""
+
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+REPLICA_PIN_KEY = 'replica-pin:{user_id}'
+
+_read_database = ContextVar('read_database', default=None)
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Применение SQLITE_PRAGMAS к новому соединению SQLite.
+
+    Для базы в памяти, которая используется в тестах, SQLite оставляет
+    собственный режим журнала, остальные параметры применяются как есть.
+    """
+
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+
+
+@receiver(request_started)
+def check_connections(**kwargs):
+    """Закрытие неработоспособных постоянных соединений.
+
+    Аналог CONN_HEALTH_CHECKS из Django 4.1: соединение, оборванное
+    сервером или пулером между запросами, закрывается до начала обработки,
+    и следующий запрос к базе откроет новое.
+    """
+
+    for connection in connections.all():
+        if (connection.settings_dict.get('CONN_HEALTH_CHECKS')
+                and connection.connection is not None
+                and not connection.in_atomic_block
+                and not connection.is_usable()):
+            connection.close()
+
+
+class ReplicaRouter:
+    """Чтение с реплики внутри ``use_replica``, остальное — с default."""
+
+    def db_for_read(self, model, **hints):
+        return _read_database.get()
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
+
+
+def get_pin_key(user):
+    return REPLICA_PIN_KEY.format(user_id=user.pk)
+
+
+def pin_to_primary(user):
+    """Чтение своих записей: запросы пользователя идут в default.
+
+    Отметка хранится в общем кеше REPLICA_STICKY_SECONDS секунд, чтобы
+    реплика успела получить изменения.
+    """
+
+    if user.is_authenticated and settings.REPLICA_STICKY_SECONDS:
+        cache.set(get_pin_key(user), True, settings.REPLICA_STICKY_SECONDS)
+
+
+def choose_replica(user):
+    """Реплика для чтения или None, если читать нужно из default."""
+
+    if not settings.DATABASE_REPLICAS:
+        return None
+    if user.is_authenticated and cache.get(get_pin_key(user)):
+        return None
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+def use_replica(alias):
+    """Направление чтения в alias; возвращает токен для ``reset_replica``."""
+
+    return _read_database.set(alias)
+
+
+def reset_replica(token):
+    _read_database.reset(token)
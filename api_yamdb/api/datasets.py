@@ -0,0 +1,134 @@
+"""Описание наборов данных static/data для загрузки и выгрузки.
+
+Выгрузка повторяет столбцы файлов static/data в том же порядке. Единственное
+отличие - столбец description в конце titles: в исходном файле его нет,
+но без него выгрузка теряла бы описания произведений. Загрузка принимает
+файлы как с ним, так и без него.
+"""
+
+import csv
+import json
+from datetime import datetime, timezone
+
+from django.utils.dateparse import parse_datetime
+
+from reviews.models import Category, Comments, Genre, Review, Title
+from users.models import User
+
+
+def optional_int(value):
+    """Целое число или None для пустого значения."""
+
+    return int(value) if value else None
+
+
+# Порядок файлов соответствует зависимостям внешних ключей.
+TABLES = (
+    ('users', User, {
+        'id': ('id', int),
+        'username': ('username', str),
+        'email': ('email', str),
+        'role': ('role', str),
+        'bio': ('bio', str),
+        'first_name': ('first_name', str),
+        'last_name': ('last_name', str),
+    }),
+    ('category', Category, {
+        'id': ('id', int),
+        'name': ('name', str),
+        'slug': ('slug', str.lower),
+    }),
+    ('genre', Genre, {
+        'id': ('id', int),
+        'name': ('name', str),
+        'slug': ('slug', str.lower),
+    }),
+    ('titles', Title, {
+        'id': ('id', int),
+        'name': ('name', str),
+        'year': ('year', int),
+        'category': ('category_id', optional_int),
+        # Нет в static/data/titles.csv, добавляется последним столбцом.
+        'description': ('description', str),
+    }),
+    ('genre_title', Title.genre.through, {
+        'id': ('id', int),
+        'title_id': ('title_id', int),
+        'genre_id': ('genre_id', int),
+    }),
+    ('review', Review, {
+        'id': ('id', int),
+        'title_id': ('title_id', int),
+        'text': ('text', str),
+        'author': ('author_id', int),
+        'score': ('score', int),
+        'pub_date': ('pub_date', parse_datetime),
+    }),
+    ('comments', Comments, {
+        'id': ('id', int),
+        'review_id': ('review_id', int),
+        'text': ('text', str),
+        'author': ('author_id', int),
+        'pub_date': ('pub_date', parse_datetime),
+    }),
+)
+
+
+TABLE_MODELS = {name: model for name, model, _ in TABLES}
+TABLE_COLUMNS = {name: columns for name, _, columns in TABLES}
+
+
+def format_value(value):
+    """Значение поля в формате файлов static/data."""
+
+    if isinstance(value, datetime):
+        return (
+            value.astimezone(timezone.utc)
+            .isoformat(timespec='milliseconds')
+            .replace('+00:00', 'Z')
+        )
+    return value
+
+
+def export_rows(name, chunk_size):
+    """Построчная выборка таблицы без загрузки её в память целиком."""
+
+    columns = TABLE_COLUMNS[name]
+    attrs = [attr for attr, _ in columns.values()]
+    rows = (
+        TABLE_MODELS[name].objects.order_by('pk')
+        .values_list(*attrs).iterator(chunk_size=chunk_size)
+    )
+    for row in rows:
+        yield [format_value(value) for value in row]
+
+
+class Echo:
+    """Псевдобуфер, возвращающий записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(name, chunk_size):
+    """Выгрузка таблицы в CSV по строкам."""
+
+    writer = csv.writer(Echo())
+    yield writer.writerow(TABLE_COLUMNS[name])
+    for row in export_rows(name, chunk_size):
+        yield writer.writerow(['' if value is None else value
+                               for value in row])
+
+
+def stream_ndjson(name, chunk_size):
+    """Выгрузка таблицы в NDJSON по строкам."""
+
+    columns = list(TABLE_COLUMNS[name])
+    for row in export_rows(name, chunk_size):
+        yield json.dumps(dict(zip(columns, row)), ensure_ascii=False) + '\n'
+
+
+EXPORT_FORMATS = {
+    'csv': (stream_csv, 'text/csv; charset=utf-8'),
+    'ndjson': (stream_ndjson, 'application/x-ndjson; charset=utf-8'),
+}
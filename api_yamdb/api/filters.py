@@ -1,21 +1,42 @@
 """Описание кастомных фильров проекта."""
 
+from django.db.models import Exists, F, OuterRef
 from django_filters import rest_framework as filters
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
 
 from reviews.models import Title
 
 
+class LowerCaseCharFilter(filters.CharFilter):
+    """Точное сравнение со значением, хранящимся в нижнем регистре."""
+
+    def filter(self, qs, value):
+        return super().filter(qs, value.lower() if value else value)
+
+
+class GenreSlugFilter(filters.CharFilter):
+    """Фильтр по жанру через EXISTS по промежуточной таблице.
+
+    В отличие от JOIN с таблицей жанров не размножает строки произведений,
+    поэтому запрос списка не требует DISTINCT и GROUP BY.
+    """
+
+    def filter(self, qs, value):
+        if not value:
+            return qs
+        return qs.filter(Exists(Title.genre.through.objects.filter(
+            title_id=OuterRef('pk'), genre__slug=value.lower()
+        )))
+
+
 class TitleFilter(filters.FilterSet):
     """Фильтрация произведений."""
 
-    category = filters.CharFilter(
+    category = LowerCaseCharFilter(
         field_name='category__slug',
-        lookup_expr='iexact'
-    )
-    genre = filters.CharFilter(
-        field_name='genre__slug',
-        lookup_expr='iexact'
+        lookup_expr='exact'
     )
+    genre = GenreSlugFilter(field_name='genre__slug')
     name = filters.CharFilter(
         field_name='name',
         lookup_expr='iexact'
@@ -23,4 +44,42 @@ class TitleFilter(filters.FilterSet):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        # Служебные поля рейтинга и версии в фильтры не попадают.
+        fields = ('id', 'name', 'year', 'category', 'genre', 'description')
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск произведений с сортировкой по релевантности."""
+
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '').strip()
+        if not text:
+            return queryset
+        return queryset.search(text)
+
+
+class TitleOrderingFilter(OrderingFilter):
+    """Сортировка произведений, в том числе ``ordering=-rating``.
+
+    Произведения без оценок всегда идут в конце, при равенстве значений
+    порядок определяется id, чтобы страницы не пересекались.
+    """
+
+    ordering_fields = ('name', 'year', 'rating', 'review_count')
+    field_names = {'review_count': 'rating_count'}
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+        expressions = []
+        for term in ordering:
+            name = term.lstrip('-')
+            field = F(self.field_names.get(name, name))
+            expressions.append(
+                field.desc(nulls_last=True) if term.startswith('-')
+                else field.asc(nulls_last=True)
+            )
+        return queryset.order_by(*expressions, 'pk')
@@ -0,0 +1,44 @@
+"""Выгрузка таблиц в формате файлов static/data."""
+
+from django.core.management.base import BaseCommand
+
+from api.datasets import EXPORT_FORMATS, TABLE_MODELS
+
+
+class Command(BaseCommand):
+    help = 'Выгружает таблицу в CSV или NDJSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'table',
+            choices=list(TABLE_MODELS),
+            help='Имя таблицы в терминах файлов static/data.'
+        )
+        parser.add_argument(
+            '--format',
+            dest='output_format',
+            choices=list(EXPORT_FORMATS),
+            default='csv',
+            help='Формат выгрузки.'
+        )
+        parser.add_argument(
+            '--output',
+            help='Файл для записи; по умолчанию стандартный вывод.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Количество строк, читаемых из БД за один раз.'
+        )
+
+    def handle(self, *args, **options):
+        stream, _ = EXPORT_FORMATS[options['output_format']]
+        lines = stream(options['table'], options['chunk_size'])
+        if options['output'] is None:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8',
+                  newline='') as file:
+            file.writelines(lines)
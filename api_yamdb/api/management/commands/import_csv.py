@@ -0,0 +1,136 @@
+"""Загрузка данных из CSV-файлов static/data."""
+
+import csv
+import time
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from api.cache import invalidate_model_resources
+from api.datasets import TABLES
+from api.pagination import invalidate_counts
+from reviews import histogram, leaderboard
+from reviews.models import Title
+from users.models import User
+
+
+@contextmanager
+def keep_auto_now_add(model):
+    """Сохранение дат из файла вместо auto_now_add при bulk_create."""
+
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = 'Загружает данные из CSV-файлов в базу данных.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'tables',
+            nargs='*',
+            help='Имена файлов без расширения; по умолчанию загружаются все.'
+        )
+        parser.add_argument(
+            '--path',
+            default=Path(settings.BASE_DIR) / 'static' / 'data',
+            type=Path,
+            help='Директория с CSV-файлами.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Количество строк в одном INSERT.'
+        )
+
+    def handle(self, *args, **options):
+        names = [name for name, _, _ in TABLES]
+        unknown = set(options['tables']) - set(names)
+        if unknown:
+            raise CommandError(
+                f'Неизвестные файлы: {", ".join(sorted(unknown))}. '
+                f'Доступны: {", ".join(names)}.'
+            )
+        selected = options['tables'] or names
+        for name, model, columns in TABLES:
+            if name not in selected:
+                continue
+            path = options['path'] / f'{name}.csv'
+            if not path.exists():
+                raise CommandError(f'Файл {path} не найден.')
+            started = time.monotonic()
+            rows = self.load_file(
+                path, model, columns, options['batch_size']
+            )
+            elapsed = max(time.monotonic() - started, 1e-9)
+            self.stdout.write(
+                f'{name}: {rows} строк за {elapsed:.2f} с '
+                f'({rows / elapsed:.0f} строк/с)'
+            )
+        if {'review', 'titles'} & set(selected):
+            Title.objects.recalculate_rating()
+            histogram.rebuild()
+        if {'review', 'titles', 'genre_title'} & set(selected):
+            leaderboard.rebuild_all()
+        for name, model, _ in TABLES:
+            if name in selected:
+                invalidate_counts(model._meta.db_table)
+                invalidate_model_resources(model)
+        self.stdout.write(self.style.SUCCESS('Загрузка завершена.'))
+
+    def load_file(self, path, model, columns, batch_size):
+        """Потоковая загрузка файла пачками в одной транзакции."""
+
+        total = 0
+        extra = {}
+        if model is User:
+            extra['password'] = make_password(None)
+        with open(path, encoding='utf-8', newline='') as file, \
+                transaction.atomic(), keep_auto_now_add(model):
+            reader = csv.DictReader(file)
+            missing = set(reader.fieldnames or ()) - set(columns)
+            if missing:
+                raise CommandError(
+                    f'{path.name}: неизвестные столбцы '
+                    f'{", ".join(sorted(missing))}.'
+                )
+            objects = (
+                model(**extra, **{
+                    columns[column][0]: columns[column][1](value)
+                    for column, value in row.items()
+                })
+                for row in reader
+            )
+            while True:
+                batch = list(islice(objects, batch_size))
+                if not batch:
+                    break
+                model.objects.bulk_create(batch, batch_size=batch_size)
+                total += len(batch)
+            self.reset_sequence(model)
+        return total
+
+    @staticmethod
+    def reset_sequence(model):
+        """Синхронизация последовательности id после явной вставки."""
+
+        statements = connection.ops.sequence_reset_sql(no_style(), [model])
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
@@ -0,0 +1,169 @@
+"""Промежуточные слои проекта."""
+
+import random
+import time
+from contextlib import ExitStack
+from itertools import chain
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+
+from . import compression, stats
+
+
+def get_endpoint_name(view_func, method):
+    """Имя вида ``TitleViewSet.list`` для представлений DRF."""
+
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        return f'{view_func.__module__}.{view_func.__name__}'
+    actions = getattr(view_func, 'actions', None) or {}
+    return f'{view_class.__name__}.{actions.get(method, method)}'
+
+
+class QueryTimer:
+    """Обёртка выполнения SQL, считающая запросы и время в базе."""
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.queries += 1
+
+
+class RequestStatsMiddleware:
+    """Сбор количества SQL-запросов и времени обработки по эндпоинтам.
+
+    Включается настройкой REQUEST_STATS_ENABLED; доля измеряемых запросов
+    задаётся REQUEST_STATS_SAMPLE_RATE. Временем сериализации считается
+    to_representation сериализаторов, сборка списков из ``.values()`` и
+    отрисовка ответа рендерером без SQL-запросов внутри них. Слой стоит
+    первым в MIDDLEWARE, чтобы полное время включало остальные
+    промежуточные слои.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_STATS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.REQUEST_STATS_SAMPLE_RATE:
+            return self.get_response(request)
+        timer = QueryTimer()
+        serialization = stats.SerializationTimer(timer)
+        token = stats.serialization_timer.set(serialization)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timer))
+                response = self.get_response(request)
+        finally:
+            stats.serialization_timer.reset(token)
+        finished = time.perf_counter()
+        endpoint = getattr(request, '_stats_endpoint', None)
+        if endpoint is None:
+            return response
+        stats.record(
+            endpoint,
+            queries=timer.queries,
+            db_seconds=timer.seconds,
+            serialization_seconds=serialization.seconds,
+            wall_seconds=finished - started,
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._stats_endpoint = get_endpoint_name(
+            view_func, request.method.lower()
+        )
+
+    def process_template_response(self, request, response):
+        serialization = stats.serialization_timer.get()
+        if serialization is not None:
+            serialization.start()
+            response.add_post_render_callback(
+                lambda response: serialization.stop()
+            )
+        return response
+
+
+class CompressionMiddleware:
+    """Сжатие ответов gzip или brotli по заголовку Accept-Encoding.
+
+    Сжимаются ответы не короче RESPONSE_COMPRESSION_MIN_LENGTH байт; порог
+    для отдельных эндпоинтов задаётся в RESPONSE_COMPRESSION_ENDPOINTS,
+    значение None там отключает сжатие. У потоковых ответов порог
+    проверяется по началу потока, остальная часть сжимается по мере
+    отдачи.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        min_length = getattr(
+            request, '_compression_min_length',
+            settings.RESPONSE_COMPRESSION_MIN_LENGTH
+        )
+        if (min_length is None
+                or response.has_header('Content-Encoding')
+                or response.status_code in (204, 304)
+                or 'no-transform' in response.get('Cache-Control', '')):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        coding = compression.choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        if coding is None:
+            return response
+        if response.streaming:
+            return self.compress_streaming(response, coding, min_length)
+        if len(response.content) < min_length:
+            return response
+        content = compression.compress(coding, response.content)
+        if len(content) >= len(response.content):
+            return response
+        response.content = content
+        response['Content-Length'] = str(len(content))
+        return self.set_encoding(response, coding)
+
+    def compress_streaming(self, response, coding, min_length):
+        chunks = iter(response.streaming_content)
+        head, length = [], 0
+        while length < min_length:
+            chunk = next(chunks, None)
+            if chunk is None:
+                response.streaming_content = head
+                return response
+            head.append(chunk)
+            length += len(chunk)
+        response.streaming_content = compression.compress_stream(
+            coding, chain(head, chunks)
+        )
+        del response['Content-Length']
+        return self.set_encoding(response, coding)
+
+    def set_encoding(self, response, coding):
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = coding
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        endpoint = get_endpoint_name(view_func, request.method.lower())
+        if endpoint in settings.RESPONSE_COMPRESSION_ENDPOINTS:
+            request._compression_min_length = (
+                settings.RESPONSE_COMPRESSION_ENDPOINTS[endpoint]
+            )
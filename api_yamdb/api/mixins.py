@@ -1,18 +1,199 @@
 """Кастомные миксины."""
 
-from rest_framework import filters, mixins
-from rest_framework.pagination import PageNumberPagination
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.functional import cached_property
+from django.utils.http import http_date
+from rest_framework import filters, mixins, status
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from reviews.models import Title
+
+from . import stats
+from .cache import count_event, get_response_key
+from .database import (choose_replica, pin_to_primary, reset_replica,
+                       use_replica)
+from .pagination import CachedCountPageNumberPagination
 from .permissions import IsAdminUserOrReadOnly
 
 
-class ModelMixinSet(mixins.ListModelMixin, mixins.CreateModelMixin,
+class ReplicaReadMixin:
+    """Чтение с реплик для безопасных методов.
+
+    Реплика выбирается после аутентификации, сами пользователи читаются из
+    default. После успешной записи пользователь на время закрепляется за
+    default, чтобы сразу видеть свои изменения.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS:
+            self.replica_token = use_replica(choose_replica(request.user))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, 'replica_token', None)
+        if token is not None:
+            reset_replica(token)
+            self.replica_token = None
+        elif (request.method not in SAFE_METHODS
+              and status.is_success(response.status_code)):
+            pin_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class FlatListViewMixin:
+    """list через flat_representation сериализатора при FLAT_LIST_SERIALIZERS.
+
+    Страница выбирается через ``.values()``, поэтому объекты моделей и
+    поля сериализатора для каждой строки не создаются.
+    """
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        if (not settings.FLAT_LIST_SERIALIZERS
+                or not hasattr(serializer_class, 'flat_representation')):
+            return super().list(request, *args, **kwargs)
+        queryset = serializer_class.get_flat_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        with stats.measure_serialization():
+            data = serializer_class.flat_representation(
+                queryset if page is None else page
+            )
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+class CachedResponseMixin:
+    """Кеширование ответов list для анонимных пользователей.
+
+    Закешированные ответы ресурса cache_resource сбрасываются сменой
+    поколения при записи в связанные модели.
+    """
+
+    cache_resource = None
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        """Ответ из кеша или от обработчика с сохранением в кеш."""
+
+        if (not settings.RESPONSE_CACHE_TIMEOUT
+                or request.user.is_authenticated):
+            return handler(request, *args, **kwargs)
+        key = get_response_key(self.cache_resource, request)
+        cached = cache.get(key)
+        if cached is not None:
+            count_event(self.cache_resource, 'hit')
+            response = Response(cached)
+            response['X-Cache'] = 'HIT'
+            return response
+        count_event(self.cache_resource, 'miss')
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class ModelMixinSet(ReplicaReadMixin, CachedResponseMixin,
+                    mixins.ListModelMixin, mixins.CreateModelMixin,
                     mixins.DestroyModelMixin, GenericViewSet):
     """Определение полей."""
 
     filter_backends = [filters.SearchFilter, ]
-    pagination_class = PageNumberPagination
+    pagination_class = CachedCountPageNumberPagination
     lookup_field = 'slug'
     search_fields = ('name',)
     permission_classes = (IsAdminUserOrReadOnly,)
+
+    def get_object(self):
+        self.kwargs[self.lookup_field] = self.kwargs[self.lookup_field].lower()
+        return super().get_object()
+
+
+class ParentObjectMixin:
+    """Однократное получение родительского объекта вложенного ресурса.
+
+    Выборка дочерних объектов фильтруется по идентификаторам из URL без
+    загрузки родителя; сам родитель запрашивается не более одного раза за
+    запрос и только при создании объекта или пустой странице списка.
+    """
+
+    parent_model = None
+    parent_lookup_kwargs = {}
+
+    def get_parent_lookup(self):
+        """Фильтр родительского объекта по параметрам URL."""
+
+        return {
+            field: self.kwargs.get(kwarg)
+            for field, kwarg in self.parent_lookup_kwargs.items()
+        }
+
+    @cached_property
+    def parent_object(self):
+        """Родительский объект, закешированный на время запроса."""
+
+        return get_object_or_404(
+            self.parent_model, **self.get_parent_lookup()
+        )
+
+    def paginate_queryset(self, queryset):
+        """Ответ 404 для пустой страницы несуществующего родителя."""
+
+        page = super().paginate_queryset(queryset)
+        if not page and not self.parent_model.objects.filter(
+                **self.get_parent_lookup()).exists():
+            raise Http404
+        return page
+
+
+class TitleVersionConditionalMixin:
+    """Условные GET-запросы по версии произведения.
+
+    ETag и Last-Modified берутся из версии и даты изменения произведения,
+    поэтому ответ 304 отдаётся после одного запроса к БД и без
+    сериализации.
+    """
+
+    title_url_kwarg = 'title_id'
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        """Ответ 304 для неизменённого произведения или ответ обработчика."""
+
+        try:
+            state = Title.objects.filter(
+                pk=self.kwargs.get(self.title_url_kwarg)
+            ).values_list('version', 'modified').first()
+        except (TypeError, ValueError):
+            raise Http404
+        if state is None:
+            return handler(request, *args, **kwargs)
+        version, modified = state
+        etag = '"{}"'.format(md5(
+            f'{request.get_full_path()}:{version}'.encode()
+        ).hexdigest())
+        last_modified = int(modified.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            return response
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
@@ -0,0 +1,248 @@
+"""Кастомные классы пагинации."""
+
+import json
+import time
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.db.models.sql import Query
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (LimitOffsetPagination,
+                                       PageNumberPagination)
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+COUNT_GENERATION_KEY = 'count-generation:{table}'
+COUNT_KEY = 'count:{signature}'
+
+
+def get_count_generations(tables):
+    """Поколения кеша количества объектов для таблиц запроса."""
+
+    keys = [COUNT_GENERATION_KEY.format(table=table) for table in tables]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, time.time_ns(), None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def invalidate_counts(*tables):
+    """Сброс закешированных количеств объектов для таблиц."""
+
+    for table in tables:
+        key = COUNT_GENERATION_KEY.format(table=table)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def estimate_count(queryset):
+    """Оценка количества строк по плану запроса PostgreSQL."""
+
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def query_tables(query):
+    """Таблицы запроса, включая таблицы подзапросов в условиях."""
+
+    tables = {join.table_name for join in query.alias_map.values()}
+    tables.add(query.model._meta.db_table)
+    nodes = [query.where, *query.annotations.values()]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, Query):
+            tables |= query_tables(node)
+            continue
+        nodes.extend(getattr(node, 'children', ()))
+        if hasattr(node, 'get_source_expressions'):
+            nodes.extend(node.get_source_expressions())
+        rhs = getattr(node, 'rhs', None)
+        if rhs is not None:
+            nodes.append(rhs)
+    return tables
+
+
+def count_queryset(queryset):
+    """Количество объектов с ограничением точного подсчёта."""
+
+    threshold = settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD
+    if threshold is None:
+        return queryset.count()
+    bounded = queryset.order_by()[:threshold + 1].count()
+    if bounded <= threshold:
+        return bounded
+    estimate = estimate_count(queryset)
+    return bounded if estimate is None else max(estimate, bounded)
+
+
+def get_cached_count(queryset):
+    """Количество объектов, закешированное по сигнатуре запроса.
+
+    Ключ кеша включает базу данных, текст запроса с параметрами и
+    поколения всех участвующих в нём таблиц, поэтому запись в любую из них
+    делает закешированное значение недоступным, а количество, прочитанное
+    с отстающей реплики, не попадает в ответы из основной базы.
+    """
+
+    query = queryset.query
+    tables = sorted(query_tables(query))
+    try:
+        sql, params = query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    signature = md5(
+        repr((
+            queryset.db, sql, params, get_count_generations(tables)
+        )).encode()
+    ).hexdigest()
+    key = COUNT_KEY.format(signature=signature)
+    count = cache.get(key)
+    if count is None:
+        count = count_queryset(queryset)
+        cache.set(key, count, settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+    return count
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator с кешированием количества объектов."""
+
+    @cached_property
+    def count(self):
+        return get_cached_count(self.object_list)
+
+
+class CachedCountPageNumberPagination(PageNumberPagination):
+    """Постраничная пагинация с кешированием количества объектов."""
+
+    django_paginator_class = CachedCountPaginator
+
+
+class CachedCountLimitOffsetPagination(LimitOffsetPagination):
+    """Пагинация limit/offset с кешированием количества объектов."""
+
+    def get_count(self, queryset):
+        return get_cached_count(queryset)
+
+
+class PubDateCursorPagination(CachedCountLimitOffsetPagination):
+    """Пагинация отзывов и комментариев.
+
+    По умолчанию работает как LimitOffsetPagination. При наличии в запросе
+    параметра ``cursor`` включается постраничный вывод по ключу
+    ``(pub_date, id)`` без OFFSET и подсчёта общего количества объектов.
+    """
+
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Неверный курсор.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.use_cursor = self.cursor_query_param in request.query_params
+        if not self.use_cursor:
+            return super().paginate_queryset(queryset, request, view)
+        self.request = request
+        self.limit = self.get_limit(request) or self.default_limit
+        position, reverse = self.decode_cursor(request)
+        if reverse:
+            queryset = queryset.order_by('pub_date', 'id')
+            if position:
+                queryset = queryset.filter(
+                    Q(pub_date__gt=position[0])
+                    | Q(pub_date=position[0], id__gt=position[1])
+                )
+        else:
+            queryset = queryset.order_by('-pub_date', '-id')
+            if position:
+                queryset = queryset.filter(
+                    Q(pub_date__lt=position[0])
+                    | Q(pub_date=position[0], id__lt=position[1])
+                )
+        page = list(queryset[:self.limit + 1])
+        has_more = len(page) > self.limit
+        page = page[:self.limit]
+        if reverse:
+            page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, bool(position)
+        self.page = page
+        return page
+
+    def decode_cursor(self, request):
+        """Позиция ``(pub_date, id)`` и направление из параметра cursor."""
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            pub_date = parse_datetime(data['d'])
+            position = (pub_date, int(data['i']))
+            reverse = bool(data['r'])
+        except (BinasciiError, KeyError, TypeError, UnicodeError,
+                ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if pub_date is None:
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, obj, reverse):
+        """Ссылка на страницу, начинающуюся после объекта obj."""
+
+        if isinstance(obj, dict):
+            pub_date, pk = obj['pub_date'], obj['id']
+        else:
+            pub_date, pk = obj.pub_date, obj.pk
+        data = json.dumps({
+            'd': pub_date.isoformat(),
+            'i': pk,
+            'r': int(reverse),
+        })
+        encoded = urlsafe_b64encode(data.encode('ascii')).decode('ascii')
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.offset_query_param
+        )
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.use_cursor:
+            return super().get_next_link()
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.use_cursor:
+            return super().get_previous_link()
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        if not self.use_cursor:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
@@ -25,7 +25,7 @@ class IsAuthorAdminSuperuserOrReadOnlyPermission(BasePermission):
         return (request.method in SAFE_METHODS
                 or (request.user.is_admin
                     or request.user.is_moderator
-                    or obj.author == request.user))
+                    or obj.author_id == request.user.id))
 
 
 class IsAdminPermission(BasePermission):
@@ -0,0 +1,78 @@
+"""Кастомные рендереры проекта."""
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class PrometheusRenderer(BaseRenderer):
+    """Текстовый формат экспозиции метрик Prometheus."""
+
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, str):
+            # Ответы с ошибками приходят словарями и отдаются как JSON.
+            return JSONRenderer().render(data)
+        return data.encode(self.charset)
+
+
+def contains_float(data):
+    """Есть ли в данных числа с плавающей точкой.
+
+    orjson записывает их иначе, чем json (``1e16`` вместо ``1e+16``,
+    ``null`` вместо ошибки для NaN), поэтому такие ответы кодирует
+    JSONRenderer.
+    """
+
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            return True
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson с тем же побайтовым результатом.
+
+    Без установленного orjson, для ответов с отступами, нестандартными
+    настройками кодирования или числами с плавающей точкой работает как
+    JSONRenderer. Даты и время форматирует кодировщик DRF.
+    """
+
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None
+                or not self.compact or not self.strict
+                or self.ensure_ascii
+                or self.get_indent(accepted_media_type or '',
+                                   renderer_context or {})
+                or contains_float(data)):
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder.default,
+                option=(orjson.OPT_NON_STR_KEYS
+                        | orjson.OPT_PASSTHROUGH_DATETIME),
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+        # Как и JSONRenderer, экранируем разделители строк для JavaScript.
+        return ret.replace(
+            '\u2028'.encode(), b'\\u2028'
+        ).replace('\u2029'.encode(), b'\\u2029')
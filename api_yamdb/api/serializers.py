@@ -1,9 +1,21 @@
 from django.conf import settings
+from django.db import models
+from django.db.models import Q
 from rest_framework import serializers, status
 
 from reviews.models import Category, Comments, Genre, Review, Title
 from users.models import User
 
+from . import stats
+
+
+class TimedRepresentationMixin:
+    """Учёт to_representation во времени сериализации запроса."""
+
+    def to_representation(self, instance):
+        with stats.measure_serialization():
+            return super().to_representation(instance)
+
 
 class TokenSerializer(serializers.Serializer):
     """Сериализация получения токена."""
@@ -19,7 +31,8 @@ class TokenSerializer(serializers.Serializer):
         )
 
 
-class BaseUserSerializer(serializers.ModelSerializer):
+class BaseUserSerializer(TimedRepresentationMixin,
+                         serializers.ModelSerializer):
     """Базовый сериализатор для пользователей."""
 
     username = serializers.RegexField(
@@ -31,6 +44,7 @@ class BaseUserSerializer(serializers.ModelSerializer):
         max_length=settings.FIELD_NAME_LENGTH,
         required=True,
     )
+    existing_user = None
 
     @staticmethod
     def validate_username(username):
@@ -42,24 +56,44 @@ class BaseUserSerializer(serializers.ModelSerializer):
             )
         return username
 
+    def get_existing_users(self, username, email):
+        """Пользователи с указанными username или email одним запросом."""
+
+        if username is None and email is None:
+            return None, None
+        users = User.objects.filter(Q(username=username) | Q(email=email))
+        by_username = by_email = None
+        for user in users[:2]:
+            if user.username == username:
+                by_username = user
+            if user.email == email:
+                by_email = user
+        return by_username, by_email
+
     def validate(self, attrs):
         """Запрет на использование занятых username и email."""
 
         username = attrs.get('username')
         email = attrs.get('email')
-        if User.objects.filter(username=username).exists():
-            if User.objects.get(username=username).email != email:
-                raise serializers.ValidationError(
-                    {"username": "Неверно указан email пользователя"},
-                    status.HTTP_400_BAD_REQUEST,
-                )
-        if User.objects.filter(email=email).exists():
-            if User.objects.get(email=email).username != username:
-                raise serializers.ValidationError(
-                    {"email": "Пользователь с таким email уже существует"},
-                )
+        by_username, by_email = self.get_existing_users(username, email)
+        self.check_existing_users(by_username, by_email, username, email)
+        self.existing_user = by_username
         return attrs
 
+    @staticmethod
+    def check_existing_users(by_username, by_email, username, email):
+        """Проверка соответствия найденных пользователей username и email."""
+
+        if by_username is not None and by_username.email != email:
+            raise serializers.ValidationError(
+                {"username": "Неверно указан email пользователя"},
+                status.HTTP_400_BAD_REQUEST,
+            )
+        if by_email is not None and by_email.username != username:
+            raise serializers.ValidationError(
+                {"email": "Пользователь с таким email уже существует"},
+            )
+
 
 class SignUpSerializer(BaseUserSerializer):
     """Сериализация при регистрации / повторного запроса подтверждения."""
@@ -70,21 +104,20 @@ class SignUpSerializer(BaseUserSerializer):
             'email',
             'username')
 
-    def validate(self, attrs):
+    @staticmethod
+    def check_existing_users(by_username, by_email, username, email):
         """Валидация на запрет повторного использования username и email не
         соответствующих друг другу."""
 
-        username = attrs.get('username')
-        email = attrs.get('email')
-        if (User.objects.filter(username=username).exists()
-                and User.objects.filter(email=email).exists()):
-            if User.objects.get(username=username).email != email:
-                raise serializers.ValidationError(
-                    {"username": "Имя пользователя не соответствует email.",
-                     "email": "email не соответствует имени пользователя."},
-                )
-
-        return super().validate(attrs)
+        if (by_username is not None and by_email is not None
+                and by_username.email != email):
+            raise serializers.ValidationError(
+                {"username": "Имя пользователя не соответствует email.",
+                 "email": "email не соответствует имени пользователя."},
+            )
+        BaseUserSerializer.check_existing_users(
+            by_username, by_email, username, email
+        )
 
 
 class UsersSerializer(BaseUserSerializer):
@@ -109,7 +142,33 @@ class UsersSerializer(BaseUserSerializer):
         )
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class LowerCaseSlugField(serializers.SlugField):
+    """Слаг, приводимый к нижнему регистру до проверки уникальности."""
+
+    def to_internal_value(self, data):
+        return super().to_internal_value(data).lower()
+
+
+class LowerCaseSlugRelatedField(serializers.SlugRelatedField):
+    """Связь по слагу без учёта регистра."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = data.lower()
+        return super().to_internal_value(data)
+
+
+class NameSlugSerializer(TimedRepresentationMixin,
+                         serializers.ModelSerializer):
+    """Базовый сериализатор моделей с полями name и slug."""
+
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.SlugField: LowerCaseSlugField,
+    }
+
+
+class CategorySerializer(NameSlugSerializer):
     """Сериализатор категорий."""
 
     class Meta:
@@ -118,7 +177,7 @@ class CategorySerializer(serializers.ModelSerializer):
         lookup_field = 'slug'
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(NameSlugSerializer):
     """Сериализатор жанров."""
 
     class Meta:
@@ -127,7 +186,27 @@ class GenreSerializer(serializers.ModelSerializer):
         lookup_field = 'slug'
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class FlatListMixin:
+    """Сериализация списков по строкам ``.values()`` без создания моделей.
+
+    Результат совпадает с выводом сериализатора по объектам; поля
+    перечисляются в flat_values, словари собирает classmethod
+    flat_representation(rows), который определяет сериализатор.
+    FlatListViewMixin использует быстрый путь только при его наличии.
+    """
+
+    flat_values = ()
+
+    @classmethod
+    def get_flat_queryset(cls, queryset):
+        return queryset.prefetch_related(None).values(*cls.flat_values)
+
+
+DATETIME_FIELD = serializers.DateTimeField()
+
+
+class TitleReadSerializer(TimedRepresentationMixin, FlatListMixin,
+                          serializers.ModelSerializer):
     """Сериализатор чтения произведений."""
 
     category = CategorySerializer(read_only=True)
@@ -149,15 +228,50 @@ class TitleReadSerializer(serializers.ModelSerializer):
             'rating'
         )
 
+    flat_values = ('id', 'name', 'year', 'category__name', 'category__slug',
+                   'description', 'rating')
+
+    @classmethod
+    def flat_representation(cls, rows):
+        rows = list(rows)
+        genres = {}
+        if rows:
+            links = Title.genre.through.objects.filter(
+                title_id__in=[row['id'] for row in rows]
+            ).order_by('genre__name').values(
+                'title_id', 'genre__name', 'genre__slug'
+            )
+            for link in links:
+                genres.setdefault(link['title_id'], []).append({
+                    'name': link['genre__name'],
+                    'slug': link['genre__slug'],
+                })
+        return [
+            {
+                'id': row['id'],
+                'name': row['name'],
+                'year': row['year'],
+                'category': None if row['category__slug'] is None else {
+                    'name': row['category__name'],
+                    'slug': row['category__slug'],
+                },
+                'description': row['description'],
+                'genre': genres.get(row['id'], []),
+                'rating': (None if row['rating'] is None
+                           else int(row['rating'])),
+            }
+            for row in rows
+        ]
+
 
 class TitleWriteSerializer(serializers.ModelSerializer):
     """Сериализатор записи произведений."""
 
-    category = serializers.SlugRelatedField(
+    category = LowerCaseSlugRelatedField(
         queryset=Category.objects.all(),
         slug_field='slug'
     )
-    genre = serializers.SlugRelatedField(
+    genre = LowerCaseSlugRelatedField(
         queryset=Genre.objects.all(),
         slug_field='slug',
         many=True,
@@ -179,7 +293,39 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         return TitleReadSerializer(instance).data
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class TitleBulkItemSerializer(serializers.ModelSerializer):
+    """Сериализатор элемента пакетной записи произведений.
+
+    Слаги категории и жанров проверяются только по формату, объекты
+    находятся одним запросом на весь пакет.
+    """
+
+    id = serializers.IntegerField(required=False)
+    category = LowerCaseSlugField()
+    genre = serializers.ListField(
+        child=LowerCaseSlugField(),
+        allow_empty=False
+    )
+
+    class Meta:
+        model = Title
+        fields = (
+            'id',
+            'name',
+            'year',
+            'category',
+            'description',
+            'genre'
+        )
+
+    def validate_genre(self, value):
+        """Повторяющиеся жанры элемента учитываются один раз."""
+
+        return list(dict.fromkeys(value))
+
+
+class ReviewSerializer(TimedRepresentationMixin, FlatListMixin,
+                       serializers.ModelSerializer):
     """Сериализатор отзывов."""
 
     author = serializers.SlugRelatedField(
@@ -197,6 +343,21 @@ class ReviewSerializer(serializers.ModelSerializer):
             'score'
         )
 
+    flat_values = ('id', 'author__username', 'text', 'pub_date', 'score')
+
+    @classmethod
+    def flat_representation(cls, rows):
+        return [
+            {
+                'id': row['id'],
+                'author': row['author__username'],
+                'text': row['text'],
+                'pub_date': DATETIME_FIELD.to_representation(row['pub_date']),
+                'score': row['score'],
+            }
+            for row in rows
+        ]
+
     def validate(self, attrs):
         if self.context['request'].method == 'POST' and Review.objects.filter(
                 author=self.context['request'].user,
@@ -207,7 +368,8 @@ class ReviewSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedRepresentationMixin, FlatListMixin,
+                        serializers.ModelSerializer):
     """Сериализатор комментариев."""
 
     author = serializers.SlugRelatedField(
@@ -223,3 +385,17 @@ class CommentSerializer(serializers.ModelSerializer):
             'text',
             'pub_date'
         )
+
+    flat_values = ('id', 'author__username', 'text', 'pub_date')
+
+    @classmethod
+    def flat_representation(cls, rows):
+        return [
+            {
+                'id': row['id'],
+                'author': row['author__username'],
+                'text': row['text'],
+                'pub_date': DATETIME_FIELD.to_representation(row['pub_date']),
+            }
+            for row in rows
+        ]
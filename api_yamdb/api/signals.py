@@ -0,0 +1,39 @@
+"""Сигналы приложения api."""
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Comments, Genre, Review, Title
+from users.models import User
+
+from .cache import invalidate_model_resources
+from .pagination import invalidate_counts
+
+# Модели, количества и ответы по которым кешируются. Обработчики
+# подключаются только к ним, чтобы удаление остальных моделей, например
+# каскадное, выполнялось одним запросом без загрузки строк.
+CACHED_MODELS = (Category, Genre, Title, Review, Comments, User)
+
+
+def invalidate_cache_on_write(sender, **kwargs):
+    """Сброс закешированных количеств и ответов при записи в модель."""
+
+    table = sender._meta.db_table
+    transaction.on_commit(lambda: invalidate_counts(table))
+    transaction.on_commit(lambda: invalidate_model_resources(sender))
+
+
+for model in CACHED_MODELS:
+    post_save.connect(invalidate_cache_on_write, sender=model)
+    post_delete.connect(invalidate_cache_on_write, sender=model)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_cache_on_m2m_change(sender, action, **kwargs):
+    """Сброс закешированных данных при изменении жанров произведения."""
+
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        table = sender._meta.db_table
+        transaction.on_commit(lambda: invalidate_counts(table))
+        transaction.on_commit(lambda: invalidate_model_resources(sender))
@@ -0,0 +1,179 @@
+"""Гистограммы стоимости запросов по эндпоинтам.
+
+Данные хранятся в памяти процесса и сбрасываются при его перезапуске;
+при нескольких воркерах каждый отдаёт собственную статистику.
+"""
+
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from contextvars import ContextVar
+from threading import Lock
+
+TIME_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+METRICS = {
+    'queries': COUNT_BUCKETS,
+    'db_seconds': TIME_BUCKETS,
+    'serialization_seconds': TIME_BUCKETS,
+    'wall_seconds': TIME_BUCKETS,
+}
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """Гистограмма с фиксированными верхними границами корзин."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0
+        self.max = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def cumulative(self):
+        """Пары (верхняя граница, количество наблюдений не больше неё)."""
+
+        total = 0
+        for bound, count in zip((*self.buckets, float('inf')), self.counts):
+            total += count
+            yield bound, total
+
+    def quantile(self, share):
+        """Оценка квантиля по верхней границе корзины."""
+
+        if not self.count:
+            return None
+        rank = share * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else None,
+            'max': self.max,
+            **{f'p{int(share * 100)}': self.quantile(share)
+               for share in QUANTILES},
+        }
+
+
+class SerializationTimer:
+    """Суммарное время сериализации ответа в пределах запроса.
+
+    Вложенные входы, например сериализаторы полей внутри сериализатора
+    списка, учитываются один раз по внешнему. Время SQL-запросов,
+    выполненных во время сериализации, вычитается по query_timer.
+    """
+
+    def __init__(self, query_timer=None):
+        self.query_timer = query_timer
+        self.seconds = 0
+        self.depth = 0
+        self.started = None
+        self.db_started = 0
+
+    def get_db_seconds(self):
+        return self.query_timer.seconds if self.query_timer else 0
+
+    def start(self):
+        if not self.depth:
+            self.started = time.perf_counter()
+            self.db_started = self.get_db_seconds()
+        self.depth += 1
+
+    def stop(self):
+        self.depth -= 1
+        if not self.depth:
+            self.seconds += (
+                time.perf_counter() - self.started
+                - (self.get_db_seconds() - self.db_started)
+            )
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+serialization_timer = ContextVar('serialization_timer', default=None)
+
+
+def measure_serialization():
+    """Контекст учёта времени сериализации текущего запроса."""
+
+    return serialization_timer.get() or nullcontext()
+
+
+_histograms = {}
+_lock = Lock()
+
+
+def record(endpoint, **values):
+    """Добавление наблюдений по эндпоинту, ключи ``values`` из METRICS."""
+
+    with _lock:
+        histograms = _histograms.get(endpoint)
+        if histograms is None:
+            histograms = _histograms[endpoint] = {
+                metric: Histogram(buckets)
+                for metric, buckets in METRICS.items()
+            }
+        for metric, value in values.items():
+            histograms[metric].observe(value)
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+def get_stats():
+    """Сводка по эндпоинтам: количество, сумма, среднее и квантили."""
+
+    with _lock:
+        return {
+            endpoint: {
+                metric: histogram.as_dict()
+                for metric, histogram in histograms.items()
+            }
+            for endpoint, histograms in sorted(_histograms.items())
+        }
+
+
+def format_bound(bound):
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+
+def render_prometheus():
+    """Гистограммы в текстовом формате экспозиции Prometheus."""
+
+    lines = []
+    with _lock:
+        for metric in METRICS:
+            name = f'yamdb_request_{metric}'
+            lines.append(f'# TYPE {name} histogram')
+            for endpoint, histograms in sorted(_histograms.items()):
+                histogram = histograms[metric]
+                label = f'endpoint="{endpoint}"'
+                for bound, total in histogram.cumulative():
+                    lines.append(
+                        f'{name}_bucket{{{label},le="{format_bound(bound)}"}}'
+                        f' {total}'
+                    )
+                lines.append(f'{name}_sum{{{label}}} {histogram.sum}')
+                lines.append(f'{name}_count{{{label}}} {histogram.count}')
+    return '\n'.join(lines) + '\n'
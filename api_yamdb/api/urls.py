@@ -1,4 +1,4 @@
-from django.urls import include, path
+from django.urls import include, path, re_path
 from rest_framework.routers import SimpleRouter
 
 from . import views
@@ -26,6 +26,17 @@ auth_patterns_v1 = [
 ]
 
 urlpatterns = [
+    re_path(
+        r'^v1/export/(?P<table>\w+)\.(?P<output>csv|ndjson)$',
+        views.ExportView.as_view(),
+        name='export'
+    ),
+    path(
+        'v1/_stats/cache/',
+        views.CacheStatsView.as_view(),
+        name='cache-stats'
+    ),
+    path('v1/_stats/', views.RequestStatsView.as_view(), name='stats'),
     path('v1/', include(router_v1.urls)),
     path('v1/auth/', include(auth_patterns_v1)),
 ]
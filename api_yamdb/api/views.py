@@ -1,25 +1,38 @@
+from functools import partial
+
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db import IntegrityError
-from django.db.models import Avg
-from django.shortcuts import get_object_or_404
+from django.db import IntegrityError, transaction
+from django.db.models import Subquery
+from django.http import Http404, StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import AccessToken
 
-from reviews.models import Category, Genre, Review, Title
+from reviews import histogram
+from reviews.models import (Category, Comments, Genre, LeaderboardEntry,
+                            Review, Title, TitleScoreHistogram)
 from users.models import User
-
-from .filters import TitleFilter
-from .mixins import ModelMixinSet
+from users.outbox import enqueue_email
+
+from . import stats
+from .authentication import UserClaimsAccessToken
+from .bulk import write_titles
+from .cache import get_stats
+from .datasets import EXPORT_FORMATS, TABLE_MODELS
+from .filters import TitleFilter, TitleOrderingFilter, TitleSearchFilter
+from .mixins import (CachedResponseMixin, FlatListViewMixin, ModelMixinSet,
+                     ParentObjectMixin, ReplicaReadMixin,
+                     TitleVersionConditionalMixin)
+from .pagination import PubDateCursorPagination
 from .permissions import (IsAdminPermission, IsAdminUserOrReadOnly,
                           IsAuthorAdminSuperuserOrReadOnlyPermission,)
+from .renderers import PrometheusRenderer
 from .serializers import (CategorySerializer, CommentSerializer,
                           GenreSerializer, SignUpSerializer,
                           ReviewSerializer, TitleReadSerializer,
@@ -42,20 +55,19 @@ class SignUpView(APIView):
 
         serializer = SignUpSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
+        user = serializer.existing_user
         try:
-            user, _ = User.objects.get_or_create(**serializer.validated_data)
+            if user is None:
+                user = User.objects.create(**serializer.validated_data)
         except IntegrityError:
             return Response(
                 'Неверные учётные данные.',
                 status=status.HTTP_400_BAD_REQUEST
             )
         confirmation_code = default_token_generator.make_token(user)
-        send_mail('Код подтверждения',
-                  f'Ваш код подтверждения: {confirmation_code}',
-                  [settings.AUTH_EMAIL, ],
-                  (user.email,),
-                  fail_silently=False,
-                  )
+        enqueue_email('Код подтверждения',
+                      f'Ваш код подтверждения: {confirmation_code}',
+                      user.email)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -107,23 +119,72 @@ class TokenView(APIView):
 
         serializer = TokenSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        if not (User.objects.filter(username=serializer.data['username'])
-                .exists()):
+        user = User.objects.filter(
+            username=serializer.data['username']
+        ).first()
+        if user is None:
             return Response({'username': 'Не верное имя пользователя.'},
                             status=status.HTTP_404_NOT_FOUND)
-        user = User.objects.get(username=serializer.data['username'])
         confirmation_code = serializer.data['confirmation_code']
         if not default_token_generator.check_token(user, confirmation_code):
             raise ValidationError({'confirmation_code': 'Неверный код'})
-        token = AccessToken.for_user(user)
+        token = UserClaimsAccessToken.for_user(user)
         return Response({'token': str(token)}, status=status.HTTP_200_OK)
 
 
+class ExportView(APIView):
+    """Потоковая выгрузка таблицы в формате файлов static/data."""
+
+    permission_classes = (IsAdminPermission,)
+    chunk_size = 2000
+
+    def get(self, request, table, output):
+        """Выгрузка таблицы в CSV или NDJSON."""
+
+        if table not in TABLE_MODELS:
+            raise Http404
+        stream, content_type = EXPORT_FORMATS[output]
+        response = StreamingHttpResponse(
+            stream(table, self.chunk_size), content_type=content_type
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{table}.{output}"'
+        )
+        return response
+
+
+class CacheStatsView(APIView):
+    """Счётчики попаданий и промахов кеша ответов."""
+
+    permission_classes = (IsAdminPermission,)
+
+    def get(self, request):
+        return Response(get_stats(), status=status.HTTP_200_OK)
+
+
+class RequestStatsView(APIView):
+    """Статистика стоимости запросов по эндпоинтам.
+
+    Формат Prometheus доступен по ``?format=prometheus``.
+    """
+
+    permission_classes = (IsAdminPermission,)
+    renderer_classes = (
+        *api_settings.DEFAULT_RENDERER_CLASSES, PrometheusRenderer
+    )
+
+    def get(self, request):
+        if request.accepted_renderer.format == PrometheusRenderer.format:
+            return Response(stats.render_prometheus())
+        return Response(stats.get_stats(), status=status.HTTP_200_OK)
+
+
 class CategoryViewSet(ModelMixinSet):
     """Получить список всех категорий без токена."""
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_resource = 'categories'
 
 
 class GenreViewSet(ModelMixinSet):
@@ -131,29 +192,141 @@ class GenreViewSet(ModelMixinSet):
 
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_resource = 'genres'
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(ReplicaReadMixin, TitleVersionConditionalMixin,
+                   CachedResponseMixin, FlatListViewMixin,
+                   viewsets.ModelViewSet):
     """Получить список всех объектов без токена."""
 
     permission_classes = (IsAdminUserOrReadOnly,)
     filterset_class = TitleFilter
-    filter_backends = (DjangoFilterBackend, )
+    filter_backends = (DjangoFilterBackend, TitleSearchFilter,
+                       TitleOrderingFilter)
     http_method_names = ['get', 'post', 'patch', 'delete']
+    cache_resource = 'titles'
+    title_url_kwarg = 'pk'
 
     def get_queryset(self):
-        queryset = Title.objects.annotate(
-            rating=Avg('reviews__score')
-        ).all()
-        return queryset
+        return Title.objects.select_related(
+            'category'
+        ).prefetch_related('genre')
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            partial(self.get_cached_response, super().retrieve),
+            request, *args, **kwargs
+        )
 
     def get_serializer_class(self):
-        if self.action in ('list', 'retrieve'):
+        if self.action in ('list', 'retrieve', 'top'):
             return TitleReadSerializer
         return TitleWriteSerializer
 
+    @action(methods=['GET'],
+            detail=False,
+            url_path='top',
+            url_name='top',
+            )
+    def top(self, request):
+        """Лучшие произведения: все, в жанре или в категории.
+
+        Читается готовый рейтинг LeaderboardEntry, поэтому время ответа
+        не зависит от количества произведений.
+        """
+
+        return self.get_cached_response(self.get_top, request)
+
+    def get_top(self, request):
+        params = request.query_params
+        metric = params.get('metric', LeaderboardEntry.METRIC_RATING)
+        if metric not in dict(LeaderboardEntry.METRIC_CHOICES):
+            raise ValidationError({'metric': [
+                'Допустимые значения: '
+                f'{", ".join(dict(LeaderboardEntry.METRIC_CHOICES))}.'
+            ]})
+        if 'genre' in params and 'category' in params:
+            raise ValidationError({'non_field_errors': [
+                'Укажите жанр или категорию, но не оба параметра сразу.'
+            ]})
+        try:
+            limit = int(params.get('limit', settings.LEADERBOARD_SIZE))
+        except ValueError:
+            raise ValidationError({'limit': ['Ожидалось целое число.']})
+        limit = max(0, min(limit, settings.LEADERBOARD_SIZE))
+
+        scope, scope_id = LeaderboardEntry.SCOPE_ALL, 0
+        for model, scope_name in ((Genre, LeaderboardEntry.SCOPE_GENRE),
+                                  (Category, LeaderboardEntry.SCOPE_CATEGORY)):
+            if scope_name in params:
+                scope, scope_id = scope_name, Subquery(model.objects.filter(
+                    slug=params[scope_name].lower()
+                ).values('pk')[:1])
+        queryset = Title.objects.filter(
+            leaderboard_entries__scope=scope,
+            leaderboard_entries__scope_id=scope_id,
+            leaderboard_entries__metric=metric,
+        ).order_by('leaderboard_entries__position')
+        if settings.FLAT_LIST_SERIALIZERS:
+            rows = list(
+                TitleReadSerializer.get_flat_queryset(queryset)[:limit]
+            )
+            with stats.measure_serialization():
+                data = TitleReadSerializer.flat_representation(rows)
+        else:
+            data = TitleReadSerializer(queryset.select_related(
+                'category'
+            ).prefetch_related('genre')[:limit], many=True).data
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(methods=['GET'],
+            detail=True,
+            url_path='stats',
+            url_name='stats',
+            )
+    def score_stats(self, request, pk=None):
+        """Количество, среднее, медиана и распределение оценок.
+
+        Читается строка TitleScoreHistogram, таблица отзывов не
+        затрагивается.
+        """
+
+        return self.get_conditional_response(
+            self.get_score_stats, request, pk=pk
+        )
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    def get_score_stats(self, request, pk):
+        row = TitleScoreHistogram.objects.filter(title_id=pk).first()
+        if row is None:
+            if not Title.objects.filter(pk=pk).exists():
+                raise Http404
+            row = TitleScoreHistogram(title_id=pk)
+        return Response(histogram.describe(row.distribution))
+
+    @action(methods=['POST'],
+            detail=False,
+            url_path='bulk',
+            url_name='bulk',
+            )
+    def bulk(self, request):
+        """Пакетное создание и изменение произведений."""
+
+        if not isinstance(request.data, list):
+            raise ValidationError(
+                {'non_field_errors': ['Ожидался список произведений.']}
+            )
+        if len(request.data) > settings.TITLES_BULK_MAX_ITEMS:
+            raise ValidationError({'non_field_errors': [
+                'Количество произведений в пакете не должно превышать '
+                f'{settings.TITLES_BULK_MAX_ITEMS}.'
+            ]})
+        return Response(write_titles(request.data), status=status.HTTP_200_OK)
+
+
+class ReviewViewSet(ReplicaReadMixin, TitleVersionConditionalMixin,
+                    ParentObjectMixin, FlatListViewMixin,
+                    viewsets.ModelViewSet):
     """Вьюсет отзывов."""
 
     serializer_class = ReviewSerializer
@@ -162,23 +335,42 @@ class ReviewViewSet(viewsets.ModelViewSet):
         permissions.IsAuthenticatedOrReadOnly
     )
     http_method_names = ['get', 'post', 'patch', 'delete']
+    pagination_class = PubDateCursorPagination
+    parent_model = Title
+    parent_lookup_kwargs = {'pk': 'title_id'}
 
-    def get_queryset(self):
-        title = get_object_or_404(
-            Title,
-            id=self.kwargs.get('title_id')
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs
         )
-        return title.reviews.all()
 
-    def perform_create(self, serializer):
-        title = get_object_or_404(
-            Title,
-            id=self.kwargs.get('title_id')
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
         )
-        serializer.save(author=self.request.user, title=title)
 
+    def get_queryset(self):
+        return Review.objects.filter(
+            title_id=self.kwargs.get('title_id')
+        ).select_related('author')
+
+    @transaction.atomic
+    def perform_create(self, serializer):
+        """Отзыв, рейтинг и распределение оценок сохраняются вместе."""
+
+        serializer.save(author=self.request.user, title=self.parent_object)
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
 
-class CommentViewSet(viewsets.ModelViewSet):
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+
+
+class CommentViewSet(ReplicaReadMixin, ParentObjectMixin,
+                     FlatListViewMixin, viewsets.ModelViewSet):
     """Вьюсет комментариев."""
 
     serializer_class = CommentSerializer
@@ -187,22 +379,19 @@ class CommentViewSet(viewsets.ModelViewSet):
         permissions.IsAuthenticatedOrReadOnly
     )
     http_method_names = ['get', 'post', 'patch', 'delete']
-
-    def get_review(self):
-        """Определение метода получения отзывов."""
-
-        return get_object_or_404(
-            Review, pk=self.kwargs.get('review_id'),
-            title_id=self.kwargs.get('title_id')
-        )
+    pagination_class = PubDateCursorPagination
+    parent_model = Review
+    parent_lookup_kwargs = {'pk': 'review_id', 'title_id': 'title_id'}
 
     def get_queryset(self):
         """Переопределение метода получения queryset комментариев."""
 
-        return self.get_review().comments.all()
+        return Comments.objects.filter(
+            review_id=self.kwargs.get('review_id'),
+            review__title_id=self.kwargs.get('title_id')
+        ).select_related('author')
 
     def perform_create(self, serializer):
         """Переопределение метода создания комментария."""
 
-        review = self.get_review()
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.parent_object)
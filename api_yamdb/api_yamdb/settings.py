@@ -36,7 +36,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.RequestStatsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -68,13 +70,82 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 # Database
 
+# По умолчанию SQLite; для PostgreSQL в .env задаются DB_ENGINE=
+# django.db.backends.postgresql, DB_NAME, DB_USER, DB_PASSWORD, DB_HOST и
+# DB_PORT. При DB_PGBOUNCER=True соединения идут через пулер в режиме
+# транзакций: серверные курсоры отключены, а statement_timeout нужно
+# задать для роли (ALTER ROLE ... SET), так как пулер не передаёт
+# параметры запуска.
+DB_ENGINE = os.getenv('DB_ENGINE', default='django.db.backends.sqlite3')
+DB_PGBOUNCER = os.getenv('DB_PGBOUNCER', default='') == 'True'
+DB_STATEMENT_TIMEOUT = int(os.getenv('DB_STATEMENT_TIMEOUT', default=0))
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'ENGINE': DB_ENGINE,
+        'NAME': os.getenv('DB_NAME', default=BASE_DIR / 'db.sqlite3'),
+        'USER': os.getenv('DB_USER', default=''),
+        'PASSWORD': os.getenv('DB_PASSWORD', default=''),
+        'HOST': os.getenv('DB_HOST', default=''),
+        'PORT': os.getenv('DB_PORT', default=''),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', default=0)),
+        # Проверка постоянного соединения перед каждым запросом,
+        # см. api.database.check_connections.
+        'CONN_HEALTH_CHECKS': (
+            os.getenv('DB_CONN_HEALTH_CHECKS', default='') == 'True'
+        ),
+        'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER,
+        'OPTIONS': {},
+    }
+}
+if DB_ENGINE == 'django.db.backends.postgresql':
+    if DB_STATEMENT_TIMEOUT and not DB_PGBOUNCER:
+        DATABASES['default']['OPTIONS']['options'] = (
+            f'-c statement_timeout={DB_STATEMENT_TIMEOUT}'
+        )
+    DATABASES['default']['OPTIONS']['connect_timeout'] = int(
+        os.getenv('DB_CONNECT_TIMEOUT', default=5)
+    )
+
+# Реплики для чтения: DB_REPLICAS — хосты PostgreSQL или пути к файлам
+# SQLite через запятую. GET-запросы к публичным ресурсам читают с реплик,
+# кроме пользователей, писавших в последние REPLICA_STICKY_SECONDS секунд.
+DATABASE_REPLICAS = []
+for index, replica in enumerate(
+        filter(None, os.getenv('DB_REPLICAS', default='').split(',')), 1):
+    alias = f'replica{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'NAME' if DB_ENGINE.endswith('sqlite3') else 'HOST': replica.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ['api.database.ReplicaRouter']
+REPLICA_STICKY_SECONDS = int(
+    os.getenv('REPLICA_STICKY_SECONDS', default=5)
+)
+
+# Настройки SQLite, применяемые к каждому новому соединению.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    'busy_timeout': 5000,
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', default='yamdb'),
     }
 }
 
+# Время жизни закешированных ответов для анонимных пользователей, 0 - без
+# кеширования.
+RESPONSE_CACHE_TIMEOUT = 60
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -119,20 +190,54 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
 
+    # JWT_AUTHENTICATION_CLASS=api.authentication.StatelessJWTAuthentication
+    # собирает пользователя для GET, HEAD и OPTIONS из данных токена без
+    # проверки is_active: заблокированный или пониженный в правах
+    # пользователь читает со старой ролью до истечения токена
+    # (SIMPLE_JWT['ACCESS_TOKEN_LIFETIME']). Изменяющие запросы всегда
+    # загружают пользователя из БД.
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        os.getenv(
+            'JWT_AUTHENTICATION_CLASS',
+            default='rest_framework_simplejwt.authentication.JWTAuthentication'
+        ),
+    ],
+
+    # FAST_JSON_RENDERER=True включает кодирование через orjson, если он
+    # установлен; вывод совпадает с JSONRenderer.
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer'
+        if os.getenv('FAST_JSON_RENDERER', default='') == 'True'
+        else 'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
 
     'DEFAULT_PAGINATION_CLASS':
-        'rest_framework.pagination.LimitOffsetPagination',
+        'api.pagination.CachedCountLimitOffsetPagination',
     'PAGE_SIZE': 10,
 }
 
+# FLAT_LIST_SERIALIZERS=True собирает списки произведений, отзывов и
+# комментариев из .values(); вывод совпадает с сериализаторами.
+FLAT_LIST_SERIALIZERS = (
+    os.getenv('FLAT_LIST_SERIALIZERS', default='') == 'True'
+)
+
+# Время жизни закешированного количества объектов в ответах с пагинацией.
+PAGINATION_COUNT_CACHE_TIMEOUT = 300
+# Порог, выше которого количество объектов оценивается по плану запроса.
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = None
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=10),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Эндпоинты, которым при api.authentication.StatelessJWTAuthentication
+# и для чтения нужен пользователь из БД: 'ИмяВьюсета' или
+# 'ИмяВьюсета.action'.
+JWT_FULL_USER_ENDPOINTS = ('UsersViewSet.about_me',)
+
 SWAGGER_SETTINGS = {
     'SECURITY_DEFINITIONS': {
         'Bearer': {
@@ -143,8 +248,24 @@ SWAGGER_SETTINGS = {
     }
 }
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_BACKEND = os.getenv(
+    'EMAIL_BACKEND',
+    default='django.core.mail.backends.filebased.EmailBackend')
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+EMAIL_HOST = os.getenv('EMAIL_HOST', default='localhost')
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', default=25))
+EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', default='')
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', default='') == 'True'
+
+# Режим отправки писем из очереди: immediate, thread или command.
+EMAIL_OUTBOX_MODE = os.getenv('EMAIL_OUTBOX_MODE', default='thread')
+EMAIL_OUTBOX_WORKERS = 2
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+# Через сколько секунд письма, захваченные упавшим процессом, снова
+# становятся доступны для отправки.
+EMAIL_OUTBOX_CLAIM_TIMEOUT = 300
 
 MAX_NAME_LENGTH = 30
 MAX_TEXT_LENGTH = 30
@@ -156,3 +277,21 @@ MAX_REVIEW_TEXT = 500
 MIN_YEAR_REALISE = -4000
 MIN_SCORE = 1
 MAX_SCORE = 10
+TITLES_BULK_MAX_ITEMS = 10000
+# Количество позиций в рейтингах лучших произведений /api/v1/titles/top/.
+LEADERBOARD_SIZE = 50
+TITLE_SEARCH_CONFIG = 'russian'
+
+# Сжатие ответов: минимальный размер тела и пороги по эндпоинтам.
+RESPONSE_COMPRESSION_MIN_LENGTH = 1024
+RESPONSE_COMPRESSION_ENDPOINTS = {
+    'ExportView.get': 0,
+}
+
+# Статистика стоимости запросов по эндпоинтам: /api/v1/_stats/.
+REQUEST_STATS_ENABLED = (
+    os.getenv('REQUEST_STATS_ENABLED', default='') == 'True'
+)
+REQUEST_STATS_SAMPLE_RATE = float(
+    os.getenv('REQUEST_STATS_SAMPLE_RATE', default=1.0)
+)
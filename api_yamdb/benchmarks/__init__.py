@@ -0,0 +1,66 @@
+"""Нагрузочные замеры API на синтетических данных.
+
+Замеры выполняются на отдельной тестовой базе, которая создаётся перед
+запуском и удаляется после него; рабочая база не затрагивается.
+"""
+
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+import django
+
+
+def setup():
+    """Инициализация Django для запуска модулей через ``python -m``."""
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    django.setup()
+
+
+@contextmanager
+def benchmark_database(keepdb=False):
+    """Отдельная тестовая база на время замеров."""
+
+    from django.db import connection
+    from django.test.utils import (setup_test_environment,
+                                   teardown_test_environment)
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, keepdb=keepdb)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(
+            old_name, verbosity=0, keepdb=keepdb
+        )
+        teardown_test_environment()
+
+
+def percentiles(samples):
+    """p50/p95/p99 и среднее по замерам в миллисекундах."""
+
+    ordered = sorted(samples)
+
+    def pick(share):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+    return {
+        'p50': pick(0.50) * 1000,
+        'p95': pick(0.95) * 1000,
+        'p99': pick(0.99) * 1000,
+        'mean': statistics.mean(ordered) * 1000,
+    }
+
+
+def measure(func, repeat):
+    """Время выполнения ``func`` в секундах для каждого из повторов."""
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return samples
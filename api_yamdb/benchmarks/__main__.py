@@ -0,0 +1,122 @@
+"""Замер задержек API на синтетических данных.
+
+Запуск из директории api_yamdb::
+
+    python -m benchmarks --titles 10000 --requests 500 --output run.json
+
+Результаты двух запусков сравниваются по сохранённым JSON-файлам.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from dataclasses import asdict, fields
+from datetime import datetime, timezone
+
+from benchmarks import benchmark_database, percentiles, setup
+from benchmarks.seed import Scale
+
+
+def get_commit():
+    try:
+        return subprocess.run(
+            ('git', 'rev-parse', '--short', 'HEAD'),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_scenario(scenario, context, requests, warmup):
+    from django.db import connection
+
+    from api.middleware import QueryTimer
+
+    for _ in range(warmup):
+        scenario(context)
+    samples = []
+    errors = 0
+    timer = QueryTimer()
+    started = time.perf_counter()
+    with connection.execute_wrapper(timer):
+        for _ in range(requests):
+            request_started = time.perf_counter()
+            response = scenario(context)
+            samples.append(time.perf_counter() - request_started)
+            errors += response.status_code >= 400
+    elapsed = time.perf_counter() - started
+    return {
+        'requests': requests,
+        'errors': errors,
+        'rps': requests / elapsed,
+        'queries_per_request': timer.queries / requests,
+        'db_ms_per_request': timer.seconds * 1000 / requests,
+        **{f'{key}_ms': value for key, value in percentiles(samples).items()},
+    }
+
+
+def main():
+    setup()
+    from django.test import override_settings
+
+    from benchmarks.scenarios import SCENARIOS, Context
+    from benchmarks.seed import seed
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    for scale_field in fields(Scale):
+        parser.add_argument(
+            f'--{scale_field.name.replace("_", "-")}',
+            type=int, default=scale_field.default,
+        )
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument(
+        '--scenario', action='append', choices=SCENARIOS,
+        help='Сценарий замера; по умолчанию выполняются все.'
+    )
+    parser.add_argument('--output', help='Файл для сохранения JSON.')
+    args = parser.parse_args()
+    scale = Scale(**{
+        scale_field.name: getattr(args, scale_field.name)
+        for scale_field in fields(Scale)
+    })
+
+    result = {
+        'commit': get_commit(),
+        'started': datetime.now(timezone.utc).isoformat(),
+        'scale': asdict(scale),
+        'requests': args.requests,
+        'scenarios': {},
+    }
+    with benchmark_database(), override_settings(
+        EMAIL_OUTBOX_MODE='command'
+    ):
+        started = time.perf_counter()
+        seed(scale, args.batch_size)
+        result['seed_seconds'] = time.perf_counter() - started
+        context = Context(scale)
+        for name in args.scenario or SCENARIOS:
+            stats = run_scenario(
+                SCENARIOS[name], context, args.requests, args.warmup
+            )
+            result['scenarios'][name] = stats
+            print(
+                f'{name:>15}: p50={stats["p50_ms"]:.2f} мс '
+                f'p95={stats["p95_ms"]:.2f} мс p99={stats["p99_ms"]:.2f} мс '
+                f'{stats["rps"]:.0f} req/s '
+                f'{stats["queries_per_request"]:.1f} запросов к БД'
+                + (f' ошибок: {stats["errors"]}' if stats['errors'] else ''),
+                file=sys.stderr,
+            )
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(result, file, ensure_ascii=False, indent=2)
+    else:
+        json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Сценарии нагрузки: каждый выполняет один запрос к API."""
+
+import random
+from dataclasses import dataclass, field
+
+from django.contrib.auth.tokens import default_token_generator
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+@dataclass
+class Context:
+    """Общее состояние сценариев одного запуска."""
+
+    scale: object
+    rng: random.Random = field(default_factory=lambda: random.Random(0))
+    counter: int = 0
+    cursors: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        from users.models import User
+
+        self.user = User.objects.get(pk=1)
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}'
+        )
+        self.anonymous = APIClient()
+        self.confirmation_code = default_token_generator.make_token(self.user)
+
+    def next_id(self):
+        self.counter += 1
+        return self.counter
+
+    def random_title(self):
+        return self.rng.randint(1, self.scale.titles)
+
+
+def title_list(context):
+    filters = context.rng.choice((
+        {},
+        {'genre': f'genre-{context.rng.randint(1, context.scale.genres)}'},
+        {'category': (
+            f'category-{context.rng.randint(1, context.scale.categories)}'
+        )},
+        {'year': context.rng.randint(1900, 2020)},
+    ))
+    return context.client.get('/api/v1/titles/', {'limit': 10, **filters})
+
+
+def review_list(context):
+    return context.client.get(
+        f'/api/v1/titles/{context.random_title()}/reviews/',
+        {'limit': 10, 'offset': context.rng.randrange(
+            max(context.scale.reviews_per_title, 1)
+        )},
+    )
+
+
+def review_cursor(context):
+    """Последовательный обход отзывов произведения по курсору."""
+
+    title_id = context.cursors.get('title') or context.random_title()
+    url = context.cursors.get('next') or (
+        f'/api/v1/titles/{title_id}/reviews/?limit=2&cursor='
+    )
+    response = context.client.get(url)
+    next_url = response.json().get('next')
+    context.cursors = {'title': title_id, 'next': next_url} if next_url else {}
+    return response
+
+
+def comment_create(context):
+    review_id = context.rng.randint(
+        1, context.scale.titles * context.scale.reviews_per_title
+    )
+    title_id = (review_id - 1) // context.scale.reviews_per_title + 1
+    return context.client.post(
+        f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+        {'text': 'Комментарий из замера'},
+        format='json',
+    )
+
+
+def signup(context):
+    index = context.next_id()
+    return context.anonymous.post('/api/v1/auth/signup/', {
+        'username': f'signup{index}',
+        'email': f'signup{index}@yamdb.fake',
+    }, format='json')
+
+
+def token(context):
+    return context.anonymous.post('/api/v1/auth/token/', {
+        'username': context.user.username,
+        'confirmation_code': context.confirmation_code,
+    }, format='json')
+
+
+SCENARIOS = {
+    'title_list': title_list,
+    'review_list': review_list,
+    'review_cursor': review_cursor,
+    'comment_create': comment_create,
+    'signup': signup,
+    'token': token,
+}
@@ -0,0 +1,134 @@
+"""Синтетический набор данных для замеров.
+
+Объекты создаются через bulk_create пачками с заранее назначенными
+первичными ключами, поэтому связи заполняются без чтения из базы и на
+SQLite, и на PostgreSQL. Денормализованный рейтинг считается при генерации.
+"""
+
+import random
+from dataclasses import dataclass
+from itertools import islice
+
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+
+@dataclass
+class Scale:
+    """Размер набора данных."""
+
+    titles: int = 1000
+    categories: int = 10
+    genres: int = 20
+    genres_per_title: int = 2
+    users: int = 100
+    reviews_per_title: int = 5
+    comments_per_review: int = 2
+
+
+def batched(objects, batch_size):
+    iterator = iter(objects)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def bulk_insert(model, objects, batch_size):
+    for batch in batched(objects, batch_size):
+        model.objects.bulk_create(batch)
+
+
+def seed(scale, batch_size=10000, random_seed=0):
+    """Заполнение пустой базы; возвращает число созданных отзывов."""
+
+    from reviews import histogram
+    from reviews.models import Category, Comments, Genre, Review, Title
+    from users.models import User
+
+    if scale.reviews_per_title > scale.users:
+        raise ValueError(
+            'Отзывов на произведение не может быть больше, чем пользователей.'
+        )
+    rng = random.Random(random_seed)
+    with transaction.atomic():
+        bulk_insert(User, (
+            User(
+                id=index,
+                username=f'bench{index}',
+                email=f'bench{index}@yamdb.fake',
+                password='!',
+            )
+            for index in range(1, scale.users + 1)
+        ), batch_size)
+        bulk_insert(Category, (
+            Category(id=index, name=f'Категория {index}',
+                     slug=f'category-{index}')
+            for index in range(1, scale.categories + 1)
+        ), batch_size)
+        bulk_insert(Genre, (
+            Genre(id=index, name=f'Жанр {index}', slug=f'genre-{index}')
+            for index in range(1, scale.genres + 1)
+        ), batch_size)
+
+        scores = {
+            title_id: [rng.randint(1, 10)
+                       for _ in range(scale.reviews_per_title)]
+            for title_id in range(1, scale.titles + 1)
+        }
+        bulk_insert(Title, (
+            Title(
+                id=title_id,
+                name=f'Произведение {title_id}',
+                year=rng.randint(1900, 2020),
+                description=f'Описание произведения {title_id}',
+                category_id=rng.randint(1, scale.categories),
+                rating_sum=sum(title_scores),
+                rating_count=len(title_scores),
+                rating=(sum(title_scores) / len(title_scores)
+                        if title_scores else None),
+            )
+            for title_id, title_scores in scores.items()
+        ), batch_size)
+        bulk_insert(Title.genre.through, (
+            Title.genre.through(title_id=title_id, genre_id=genre_id)
+            for title_id in scores
+            for genre_id in rng.sample(
+                range(1, scale.genres + 1), scale.genres_per_title
+            )
+        ), batch_size)
+
+        def reviews():
+            review_id = 0
+            for title_id, title_scores in scores.items():
+                first_author = rng.randrange(scale.users)
+                for offset, score in enumerate(title_scores):
+                    review_id += 1
+                    yield Review(
+                        id=review_id,
+                        title_id=title_id,
+                        author_id=(first_author + offset) % scale.users + 1,
+                        text=f'Отзыв {review_id}',
+                        score=score,
+                    )
+
+        bulk_insert(Review, reviews(), batch_size)
+        review_count = scale.titles * scale.reviews_per_title
+        bulk_insert(Comments, (
+            Comments(
+                review_id=review_id,
+                author_id=rng.randint(1, scale.users),
+                text=f'Комментарий к отзыву {review_id}',
+            )
+            for review_id in range(1, review_count + 1)
+            for _ in range(scale.comments_per_review)
+        ), batch_size)
+        histogram.rebuild(batch_size=batch_size)
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), [User, Category, Genre, Title, Review]
+        )
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+    return review_count
@@ -0,0 +1,79 @@
+"""Процессорное время на строку списка: сериализатор против .values().
+
+Сравниваются четыре варианта страницы списка произведений: ModelSerializer
+или flat_representation, отрисованные JSONRenderer или FastJSONRenderer.
+Запуск из директории api_yamdb::
+
+    python -m benchmarks.serialization --titles 1000 --limit 100
+"""
+
+import argparse
+import time
+
+from benchmarks import benchmark_database, setup
+
+
+def cpu_per_row(func, rows, repeat):
+    """Процессорное время одного вызова в микросекундах на строку."""
+
+    func()
+    started = time.process_time()
+    for _ in range(repeat):
+        func()
+    return (time.process_time() - started) * 1e6 / repeat / rows
+
+
+def run(titles, limit, repeat):
+    from rest_framework.renderers import JSONRenderer
+
+    from api.renderers import FastJSONRenderer, orjson
+    from api.serializers import TitleReadSerializer
+    from benchmarks.seed import Scale, seed
+    from reviews.models import Title
+
+    seed(Scale(titles=titles, reviews_per_title=0, comments_per_review=0))
+    queryset = Title.objects.select_related('category').prefetch_related(
+        'genre'
+    )
+
+    def serializer():
+        return TitleReadSerializer(queryset[:limit], many=True).data
+
+    def flat():
+        return TitleReadSerializer.flat_representation(
+            TitleReadSerializer.get_flat_queryset(queryset)[:limit]
+        )
+
+    assert JSONRenderer().render(serializer()) == (
+        FastJSONRenderer().render(flat())
+    ), 'Вывод быстрых путей отличается от сериализатора.'
+    variants = {
+        'serializer + JSONRenderer': (serializer, JSONRenderer()),
+        'serializer + FastJSONRenderer': (serializer, FastJSONRenderer()),
+        'values + JSONRenderer': (flat, JSONRenderer()),
+        'values + FastJSONRenderer': (flat, FastJSONRenderer()),
+    }
+    if orjson is None:
+        print('orjson не установлен, FastJSONRenderer работает как '
+              'JSONRenderer.')
+    baseline = None
+    for name, (build, renderer) in variants.items():
+        spent = cpu_per_row(lambda: renderer.render(build()), limit, repeat)
+        baseline = baseline or spent
+        print(f'{name:>30}: {spent:7.1f} мкс/строка '
+              f'({spent / baseline:.0%} от исходного)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=1000)
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    setup()
+    with benchmark_database():
+        run(args.titles, args.limit, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
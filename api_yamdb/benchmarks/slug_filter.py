@@ -0,0 +1,59 @@
+"""Задержка списка произведений с фильтром по жанру.
+
+Запросы ``/api/v1/titles/?genre=...`` выполняются через тестовый клиент,
+поэтому в замер входят фильтр, пагинация и сериализация. Слаг передаётся
+как в нижнем, так и в верхнем регистре. Запуск из директории api_yamdb::
+
+    python -m benchmarks.slug_filter --titles 1000000
+"""
+
+import argparse
+
+from benchmarks import benchmark_database, measure, percentiles, setup
+
+URL = '/api/v1/titles/'
+
+
+def run(titles, repeat, batch_size):
+    from benchmarks.scenarios import Context
+    from benchmarks.seed import Scale, seed
+
+    scale = Scale(titles=titles, users=1, reviews_per_title=0,
+                  comments_per_review=0)
+    seed(scale, batch_size)
+    context = Context(scale)
+
+    def request(transform):
+        slug = f'genre-{context.rng.randint(1, scale.genres)}'
+        response = context.client.get(
+            URL, {'genre': transform(slug), 'limit': 10}
+        )
+        assert response.status_code == 200, response.status_code
+
+    cases = {
+        'lower': lambda: request(str.lower),
+        'upper': lambda: request(str.upper),
+    }
+    for name, case in cases.items():
+        case()
+        stats = percentiles(measure(case, repeat))
+        print(
+            f'{name:>8}: ' + ', '.join(
+                f'{key}={value:.2f} мс' for key, value in stats.items()
+            )
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--batch-size', type=int, default=10000)
+    args = parser.parse_args()
+    setup()
+    with benchmark_database():
+        run(args.titles, args.repeat, args.batch_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,7 +2,8 @@
 
 from django.contrib import admin
 
-from .models import Category, Comments, Genre, Review, Title
+from .models import (Category, Comments, Genre, LeaderboardEntry, Review,
+                     Title)
 
 
 class CategoryGenreAdmin(admin.ModelAdmin):
@@ -37,7 +38,10 @@ class TitleAdmin(admin.ModelAdmin):
                     'year',
                     'category',
                     'description',
+                    'rating',
                     )
+    readonly_fields = ('rating_sum', 'rating_count', 'rating', 'version',
+                       'modified')
     filter_horizontal = ('genre',)
     list_editable = ('category', 'description')
     search_fields = ('name', 'year')
@@ -58,8 +62,22 @@ class ReviewAdmin(admin.ModelAdmin):
     list_display_links = ('id',)
 
 
+class LeaderboardEntryAdmin(admin.ModelAdmin):
+    """Представление модели LeaderboardEntry."""
+    list_display = ('scope',
+                    'scope_id',
+                    'metric',
+                    'position',
+                    'title',
+                    'value')
+    list_filter = ('scope', 'metric')
+    readonly_fields = ('scope', 'scope_id', 'metric', 'position', 'title',
+                       'value')
+
+
 admin.site.register(Category, CategoryGenreAdmin)
 admin.site.register(Genre, CategoryGenreAdmin)
 admin.site.register(Comments, CommentAdmin)
 admin.site.register(Title, TitleAdmin)
 admin.site.register(Review, ReviewAdmin)
+admin.site.register(LeaderboardEntry, LeaderboardEntryAdmin)
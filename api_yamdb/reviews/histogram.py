@@ -0,0 +1,80 @@
+"""Распределение оценок произведений по значениям.
+
+Счётчики хранятся в TitleScoreHistogram по строке на произведение и
+сдвигаются одним UPDATE при записи отзыва, поэтому статистика по
+произведению читается без обращения к таблице отзывов.
+"""
+
+from collections import defaultdict
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import SCORES, get_score_field
+
+
+def shift(title_id, deltas):
+    """Сдвиг счётчиков произведения на deltas: {оценка: изменение}."""
+
+    from .models import TitleScoreHistogram
+
+    changes = {
+        get_score_field(score): F(get_score_field(score)) + delta
+        for score, delta in deltas.items() if delta
+    }
+    if changes:
+        TitleScoreHistogram.objects.filter(title_id=title_id).update(
+            **changes
+        )
+
+
+def rebuild(title_ids=None, apps=global_apps, batch_size=1000):
+    """Пересчёт распределений по таблице отзывов."""
+
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    Histogram = apps.get_model('reviews', 'TitleScoreHistogram')
+    titles = Title.objects.all()
+    if title_ids is not None:
+        titles = titles.filter(pk__in=title_ids)
+    counts = defaultdict(dict)
+    rows = Review.objects.filter(title__in=titles).order_by().values(
+        'title_id', 'score'
+    ).annotate(count=Count('id'))
+    for row in rows:
+        counts[row['title_id']][get_score_field(row['score'])] = row['count']
+    with transaction.atomic():
+        Histogram.objects.filter(title__in=titles).delete()
+        Histogram.objects.bulk_create(
+            (Histogram(title_id=title_id, **counts[title_id])
+             for title_id in titles.values_list('pk', flat=True)),
+            batch_size=batch_size,
+        )
+
+
+def describe(distribution):
+    """Количество, среднее, медиана и распределение оценок."""
+
+    count = sum(distribution.values())
+    if not count:
+        return {'count': 0, 'mean': None, 'median': None,
+                'distribution': distribution}
+    total = sum(score * number for score, number in distribution.items())
+
+    def nth(position):
+        seen = 0
+        for score in SCORES:
+            seen += distribution[score]
+            if seen > position:
+                return score
+
+    middle = count // 2
+    median = (nth(middle) if count % 2
+              else (nth(middle - 1) + nth(middle)) / 2)
+    return {
+        'count': count,
+        'mean': total / count,
+        'median': median,
+        'distribution': distribution,
+    }
@@ -0,0 +1,195 @@
+"""Рейтинги лучших произведений: общий, по категориям и по жанрам.
+
+Каждый рейтинг хранит первые LEADERBOARD_SIZE произведений по метрике в
+таблице LeaderboardEntry. При изменении оценок произведения его позиция
+пересчитывается по уже сохранённому рейтингу; выборка из всех
+произведений нужна, только когда произведение опускается ниже последней
+позиции заполненного рейтинга и его место может занять другое.
+"""
+
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+
+METRIC_FIELDS = {
+    'rating': 'rating',
+    'review_count': 'rating_count',
+}
+REBUILD = object()
+# Первые ключи advisory-блокировок рейтингов PostgreSQL по областям.
+SCOPE_LOCK_KEYS = {
+    'all': 7301,
+    'category': 7302,
+    'genre': 7303,
+}
+
+
+def sort_key(item):
+    """Порядок позиций: по убыванию значения, затем по id произведения."""
+
+    title_id, value = item
+    return -value, title_id
+
+
+def get_scope_filter(scope, scope_id):
+    if scope == 'category':
+        return Q(category_id=scope_id)
+    if scope == 'genre':
+        return Q(genre=scope_id)
+    return Q()
+
+
+def get_title_scopes(title_ids, apps=global_apps):
+    """Рейтинги, в которых участвуют произведения."""
+
+    Title = apps.get_model('reviews', 'Title')
+    scopes = set()
+    rows = Title.objects.filter(pk__in=title_ids).order_by().values_list(
+        'category_id', 'genre'
+    )
+    for category_id, genre_id in rows:
+        scopes.add(('all', 0))
+        if category_id is not None:
+            scopes.add(('category', category_id))
+        if genre_id is not None:
+            scopes.add(('genre', genre_id))
+    return scopes
+
+
+def lock_scopes(scopes):
+    """Блокировка рейтингов областей до конца текущей транзакции.
+
+    В PostgreSQL берутся advisory-блокировки в фиксированном порядке, они
+    защищают и ещё пустые рейтинги, строки которых нельзя заблокировать
+    через SELECT ... FOR UPDATE. SQLite и так допускает только одну
+    пишущую транзакцию.
+    """
+
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        for scope, scope_id in sorted(scopes):
+            cursor.execute('SELECT pg_advisory_xact_lock(%s, %s)',
+                           [SCOPE_LOCK_KEYS[scope], scope_id])
+
+
+def select_top(scope, scope_id, metric, apps=global_apps):
+    """Первые позиции рейтинга по таблице произведений."""
+
+    Title = apps.get_model('reviews', 'Title')
+    field = METRIC_FIELDS[metric]
+    return [
+        (title_id, float(value))
+        for title_id, value in Title.objects.filter(
+            get_scope_filter(scope, scope_id), rating_count__gt=0
+        ).order_by(F(field).desc(), 'pk').values_list(
+            'pk', field
+        )[:settings.LEADERBOARD_SIZE]
+    ]
+
+
+def write_board(scope, scope_id, metric, items, apps=global_apps):
+    Entry = apps.get_model('reviews', 'LeaderboardEntry')
+    Entry.objects.filter(scope=scope, scope_id=scope_id,
+                         metric=metric).delete()
+    Entry.objects.bulk_create(
+        Entry(scope=scope, scope_id=scope_id, metric=metric,
+              position=position, title_id=title_id, value=value)
+        for position, (title_id, value) in enumerate(items, 1)
+    )
+
+
+def rebuild_scopes(scopes, apps=global_apps):
+    """Полная пересборка рейтингов по таблице произведений."""
+
+    with transaction.atomic():
+        lock_scopes(scopes)
+        for scope, scope_id in scopes:
+            for metric in METRIC_FIELDS:
+                write_board(scope, scope_id, metric,
+                            select_top(scope, scope_id, metric, apps), apps)
+
+
+def rebuild_all(apps=global_apps):
+    Category = apps.get_model('reviews', 'Category')
+    Genre = apps.get_model('reviews', 'Genre')
+    Entry = apps.get_model('reviews', 'LeaderboardEntry')
+    scopes = [('all', 0)]
+    scopes += [('category', pk) for pk in
+               Category.objects.values_list('pk', flat=True)]
+    scopes += [('genre', pk) for pk in
+               Genre.objects.values_list('pk', flat=True)]
+    with transaction.atomic():
+        Entry.objects.all().delete()
+        rebuild_scopes(scopes, apps)
+
+
+def merge(board, title_id, value, size):
+    """Новый состав рейтинга после изменения значения произведения.
+
+    Возвращает None, если рейтинг не изменился, и REBUILD, если его нужно
+    собрать заново по таблице произведений.
+    """
+
+    others = [item for item in board if item[0] != title_id]
+    in_board = len(others) != len(board)
+    full = len(board) >= size
+    if value is None:
+        if not in_board:
+            return None
+        return REBUILD if full else others
+    item = (title_id, value)
+    if full and sort_key(item) > sort_key(board[-1]):
+        return REBUILD if in_board else None
+    items = sorted(others + [item], key=sort_key)[:size]
+    return None if items == board else items
+
+
+def update_title(title_id):
+    """Обновление рейтингов после изменения оценок произведения.
+
+    Рейтинги читаются и записываются в одной транзакции под блокировкой
+    областей, поэтому параллельные обновления не теряют друг друга.
+    """
+
+    from .models import LeaderboardEntry, Title
+
+    with transaction.atomic():
+        scopes = get_title_scopes([title_id])
+        if not scopes:
+            return
+        lock_scopes(scopes)
+        # Оценки читаются после блокировки: параллельное обновление того же
+        # произведения, взявшее её раньше, уже зафиксировано.
+        row = Title.objects.filter(pk=title_id).values(
+            'rating', 'rating_count'
+        ).first()
+        if row is None:
+            return
+        boards = defaultdict(list)
+        entries = LeaderboardEntry.objects.select_for_update().filter(
+            reduce(or_, (Q(scope=scope, scope_id=scope_id)
+                         for scope, scope_id in scopes))
+        ).order_by('scope', 'scope_id', 'metric', 'position').values_list(
+            'scope', 'scope_id', 'metric', 'title_id', 'value'
+        )
+        for scope, scope_id, metric, entry_title_id, value in entries:
+            boards[scope, scope_id, metric].append((entry_title_id, value))
+
+        for scope, scope_id in scopes:
+            for metric, field in METRIC_FIELDS.items():
+                value = row[field] if row['rating_count'] else None
+                items = merge(
+                    boards[scope, scope_id, metric], title_id,
+                    None if value is None else float(value),
+                    settings.LEADERBOARD_SIZE,
+                )
+                if items is REBUILD:
+                    items = select_top(scope, scope_id, metric)
+                if items is not None:
+                    write_board(scope, scope_id, metric, items)
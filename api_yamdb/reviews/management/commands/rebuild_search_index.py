@@ -0,0 +1,16 @@
+"""Пересоздание полнотекстового индекса произведений."""
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from reviews.search import create_search_index, drop_search_index
+
+
+class Command(BaseCommand):
+    help = 'Пересоздаёт полнотекстовый индекс по названиям и описаниям.'
+
+    def handle(self, *args, **options):
+        with connection.schema_editor() as schema_editor:
+            drop_search_index(schema_editor)
+            create_search_index(schema_editor)
+        self.stdout.write(self.style.SUCCESS('Индекс поиска пересоздан.'))
@@ -0,0 +1,30 @@
+"""Пересчёт денормализованного рейтинга произведений."""
+
+from django.core.management.base import BaseCommand
+
+from reviews import histogram, leaderboard
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает сумму, количество оценок и рейтинг произведений, '
+            'распределение оценок и рейтинги лучших произведений.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'title_ids',
+            nargs='*',
+            type=int,
+            help='id произведений; по умолчанию пересчитываются все.'
+        )
+
+    def handle(self, *args, **options):
+        titles = Title.objects.all()
+        if options['title_ids']:
+            titles = titles.filter(pk__in=options['title_ids'])
+        updated = titles.recalculate_rating()
+        histogram.rebuild(options['title_ids'] or None)
+        leaderboard.rebuild_all()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитан рейтинг произведений: {updated}')
+        )
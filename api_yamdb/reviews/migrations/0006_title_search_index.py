@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.db import migrations
+
+SQLITE_CREATE = (
+    "CREATE VIRTUAL TABLE reviews_title_fts USING fts5("
+    "name, description, content='reviews_title', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS reviews_title_fts_ai AFTER INSERT "
+    "ON reviews_title BEGIN "
+    "INSERT INTO reviews_title_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS reviews_title_fts_ad AFTER DELETE "
+    "ON reviews_title BEGIN "
+    "INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name, "
+    "description) VALUES ('delete', old.id, old.name, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS reviews_title_fts_au "
+    "AFTER UPDATE OF name, description ON reviews_title BEGIN "
+    "INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name, "
+    "description) VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO reviews_title_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    "INSERT INTO reviews_title_fts(reviews_title_fts) VALUES ('rebuild')",
+)
+SQLITE_DROP = (
+    'DROP TRIGGER IF EXISTS reviews_title_fts_ai',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_ad',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_au',
+    'DROP TABLE IF EXISTS reviews_title_fts',
+)
+
+
+def forwards(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for sql in SQLITE_CREATE:
+            schema_editor.execute(sql)
+    elif vendor == 'postgresql':
+        config = settings.TITLE_SEARCH_CONFIG
+        schema_editor.execute(
+            'CREATE INDEX reviews_title_search_idx ON reviews_title '
+            f"USING GIN ((to_tsvector('{config}'::regconfig, "
+            "coalesce(reviews_title.name, '') || ' ' || "
+            "coalesce(reviews_title.description, ''))))"
+        )
+
+
+def backwards(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for sql in SQLITE_DROP:
+            schema_editor.execute(sql)
+    elif vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS reviews_title_search_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_title_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
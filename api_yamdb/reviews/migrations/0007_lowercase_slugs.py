@@ -0,0 +1,32 @@
+# Generated by Django 3.2 on 2026-10-18 09:00
+
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def lowercase_slugs(apps, schema_editor):
+    for model_name in ('Category', 'Genre'):
+        model = apps.get_model('reviews', model_name)
+        duplicates = list(
+            model.objects.order_by().values(lower_slug=Lower('slug'))
+            .annotate(count=Count('id')).filter(count__gt=1)
+            .values_list('lower_slug', flat=True)
+        )
+        if duplicates:
+            raise RuntimeError(
+                f'{model_name}: слаги совпадают без учёта регистра: '
+                f'{", ".join(duplicates)}'
+            )
+        model.objects.exclude(slug=Lower('slug')).update(slug=Lower('slug'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_slugs, migrations.RunPython.noop),
+    ]
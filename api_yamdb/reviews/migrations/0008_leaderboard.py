@@ -0,0 +1,73 @@
+# Generated by Django 3.2 on 2026-10-18 03:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+METRIC_FIELDS = {
+    'rating': 'rating',
+    'review_count': 'rating_count',
+}
+
+
+def fill_leaderboards(apps, schema_editor):
+    Category = apps.get_model('reviews', 'Category')
+    Genre = apps.get_model('reviews', 'Genre')
+    Title = apps.get_model('reviews', 'Title')
+    Entry = apps.get_model('reviews', 'LeaderboardEntry')
+    scopes = [('all', 0, models.Q())]
+    scopes += [('category', pk, models.Q(category_id=pk))
+               for pk in Category.objects.values_list('pk', flat=True)]
+    scopes += [('genre', pk, models.Q(genre=pk))
+               for pk in Genre.objects.values_list('pk', flat=True)]
+    entries = []
+    for scope, scope_id, scope_filter in scopes:
+        for metric, field in METRIC_FIELDS.items():
+            top = Title.objects.filter(
+                scope_filter, rating_count__gt=0
+            ).order_by(models.F(field).desc(), 'pk').values_list(
+                'pk', field
+            )[:settings.LEADERBOARD_SIZE]
+            entries += [
+                Entry(scope=scope, scope_id=scope_id, metric=metric,
+                      position=position, title_id=title_id,
+                      value=float(value))
+                for position, (title_id, value) in enumerate(top, 1)
+            ]
+    Entry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_lowercase_slugs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('all', 'Все произведения'), ('category', 'Категория'), ('genre', 'Жанр')], max_length=16, verbose_name='Область')),
+                ('scope_id', models.PositiveIntegerField(default=0, verbose_name='id категории или жанра')),
+                ('metric', models.CharField(choices=[('rating', 'Рейтинг'), ('review_count', 'Количество отзывов')], max_length=16, verbose_name='Метрика')),
+                ('position', models.PositiveSmallIntegerField(verbose_name='Позиция')),
+                ('value', models.FloatField(verbose_name='Значение')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'позиция в рейтинге',
+                'verbose_name_plural': 'Рейтинги лучших',
+                'ordering': ('scope', 'scope_id', 'metric', 'position'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['scope', 'scope_id', 'metric', 'position'], name='leaderboard_position_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(fields=('scope', 'scope_id', 'metric', 'title'), name='unique leaderboard title'),
+        ),
+        migrations.RunPython(fill_leaderboards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 3.2 on 2026-10-18 03:44
+
+from collections import defaultdict
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_histograms(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    Histogram = apps.get_model('reviews', 'TitleScoreHistogram')
+    counts = defaultdict(dict)
+    rows = Review.objects.order_by().values('title_id', 'score').annotate(
+        count=models.Count('id')
+    )
+    for row in rows:
+        counts[row['title_id']][f'score_{row["score"]}'] = row['count']
+    Histogram.objects.bulk_create(
+        (Histogram(title_id=title_id, **counts[title_id])
+         for title_id in Title.objects.values_list('pk', flat=True)),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_leaderboard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleScoreHistogram',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='score_histogram', serialize=False, to='reviews.title', verbose_name='Произведение')),
+                ('score_1', models.PositiveIntegerField(default=0, verbose_name='Оценка 1')),
+                ('score_2', models.PositiveIntegerField(default=0, verbose_name='Оценка 2')),
+                ('score_3', models.PositiveIntegerField(default=0, verbose_name='Оценка 3')),
+                ('score_4', models.PositiveIntegerField(default=0, verbose_name='Оценка 4')),
+                ('score_5', models.PositiveIntegerField(default=0, verbose_name='Оценка 5')),
+                ('score_6', models.PositiveIntegerField(default=0, verbose_name='Оценка 6')),
+                ('score_7', models.PositiveIntegerField(default=0, verbose_name='Оценка 7')),
+                ('score_8', models.PositiveIntegerField(default=0, verbose_name='Оценка 8')),
+                ('score_9', models.PositiveIntegerField(default=0, verbose_name='Оценка 9')),
+                ('score_10', models.PositiveIntegerField(default=0, verbose_name='Оценка 10')),
+            ],
+            options={
+                'verbose_name': 'распределение оценок',
+                'verbose_name_plural': 'Распределения оценок',
+            },
+        ),
+        migrations.RunPython(fill_histograms, migrations.RunPython.noop),
+    ]
@@ -4,10 +4,29 @@ from django.utils import timezone
 
 from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import (Case, Count, F, FloatField, OuterRef, Subquery,
+                              Sum, When)
+from django.db.models.functions import Cast, Coalesce, Now
 
 from users.models import User
 
+from .search import search_titles
+
+RATING_EXPRESSION = Case(
+    When(rating_count=0, then=None),
+    default=(Cast('rating_sum', FloatField())
+             / Cast('rating_count', FloatField())),
+    output_field=FloatField(),
+)
+SCORES = range(settings.MIN_SCORE, settings.MAX_SCORE + 1)
+
+
+def get_score_field(score):
+    """Имя счётчика оценки в TitleScoreHistogram."""
+
+    return f'score_{score}'
+
 
 class NameSlugModel(models.Model):
     """Базовая модель для моделей содержащих поля Name и Slug."""
@@ -29,6 +48,12 @@ class NameSlugModel(models.Model):
     def __str__(self):
         return self.name[:settings.MAX_NAME_LENGTH]
 
+    def save(self, *args, **kwargs):
+        """Слаг хранится в нижнем регистре для поиска по точному индексу."""
+
+        self.slug = self.slug.lower()
+        super().save(*args, **kwargs)
+
 
 class ReviewCommentModel(models.Model):
     """Базовая модель для моделей Review и Comment."""
@@ -71,6 +96,56 @@ class Genre(NameSlugModel):
         verbose_name_plural = 'Жанры'
 
 
+class TitleQuerySet(models.QuerySet):
+    """Операции над денормализованным рейтингом и версией произведений."""
+
+    def search(self, text):
+        """Полнотекстовый поиск по названию и описанию."""
+
+        return search_titles(self, text)
+
+    def touch(self):
+        """Увеличение версии произведений для условных запросов."""
+
+        return self.update(version=F('version') + 1, modified=Now())
+
+    def shift_rating(self, score_delta, count_delta):
+        """Атомарный сдвиг суммы и количества оценок с пересчётом рейтинга."""
+
+        with transaction.atomic():
+            self.update(
+                rating_sum=F('rating_sum') + score_delta,
+                rating_count=F('rating_count') + count_delta,
+                version=F('version') + 1,
+                modified=Now(),
+            )
+            self.update(rating=RATING_EXPRESSION)
+
+    def recalculate_rating(self):
+        """Полный пересчёт рейтинга по таблице отзывов."""
+
+        reviews = Review.objects.filter(
+            title_id=OuterRef('pk')
+        ).order_by().values('title_id')
+        with transaction.atomic():
+            updated = self.update(
+                rating_sum=Coalesce(
+                    Subquery(reviews.annotate(total=Sum('score'))
+                             .values('total')),
+                    0
+                ),
+                rating_count=Coalesce(
+                    Subquery(reviews.annotate(total=Count('id'))
+                             .values('total')),
+                    0
+                ),
+                version=F('version') + 1,
+                modified=Now(),
+            )
+            self.update(rating=RATING_EXPRESSION)
+        return updated
+
+
 class Title(models.Model):
     """Модель произведений."""
 
@@ -109,6 +184,29 @@ class Title(models.Model):
         Genre, related_name='titles',
         verbose_name='Жанр'
     )
+    rating_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0,
+    )
+    rating_count = models.PositiveIntegerField(
+        'Количество оценок',
+        default=0,
+    )
+    rating = models.FloatField(
+        'Рейтинг',
+        null=True,
+        blank=True,
+    )
+    version = models.PositiveIntegerField(
+        'Версия',
+        default=0,
+    )
+    modified = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True,
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Произведение'
@@ -118,6 +216,14 @@ class Title(models.Model):
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминание загруженной категории для обновления рейтингов."""
+
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_category_id = instance.__dict__.get('category_id')
+        return instance
+
 
 class Review(ReviewCommentModel):
     """Модель отзывов."""
@@ -140,12 +246,27 @@ class Review(ReviewCommentModel):
         ],
     )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминание загруженной оценки для пересчёта рейтинга."""
+
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        instance._loaded_title_id = instance.__dict__.get('title_id')
+        return instance
+
     class Meta(ReviewCommentModel.Meta):
         constraints = [
             models.UniqueConstraint(
                 fields=['author', 'title'], name='unique review'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['title', '-pub_date', '-id'],
+                name='review_title_pub_date_idx'
+            )
+        ]
         verbose_name = 'отзыв'
         verbose_name_plural = 'Отзывы'
 
@@ -161,5 +282,115 @@ class Comments(ReviewCommentModel):
     )
 
     class Meta(ReviewCommentModel.Meta):
+        indexes = [
+            models.Index(
+                fields=['review', '-pub_date', '-id'],
+                name='comment_review_pub_date_idx'
+            )
+        ]
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
+
+
+class TitleScoreHistogram(models.Model):
+    """Количество оценок произведения по каждому значению от 1 до 10.
+
+    Поля score_<оценка> добавляются ниже по диапазону
+    MIN_SCORE..MAX_SCORE и обновляются атомарно при записи отзывов.
+    """
+
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='score_histogram',
+        verbose_name='Произведение'
+    )
+
+    class Meta:
+        verbose_name = 'распределение оценок'
+        verbose_name_plural = 'Распределения оценок'
+
+    def __str__(self):
+        return f'Оценки произведения {self.title_id}'
+
+    @property
+    def distribution(self):
+        """Словарь оценка -> количество."""
+
+        return {score: getattr(self, get_score_field(score))
+                for score in SCORES}
+
+
+for score in SCORES:
+    TitleScoreHistogram.add_to_class(
+        get_score_field(score),
+        models.PositiveIntegerField(f'Оценка {score}', default=0)
+    )
+del score
+
+
+class LeaderboardEntry(models.Model):
+    """Позиция произведения в рейтинге лучших.
+
+    Рейтинги ведутся по всем произведениям, по категории и по жанру для
+    каждой метрики и содержат не больше LEADERBOARD_SIZE позиций.
+    """
+
+    SCOPE_ALL = 'all'
+    SCOPE_CATEGORY = 'category'
+    SCOPE_GENRE = 'genre'
+    SCOPE_CHOICES = (
+        (SCOPE_ALL, 'Все произведения'),
+        (SCOPE_CATEGORY, 'Категория'),
+        (SCOPE_GENRE, 'Жанр'),
+    )
+    METRIC_RATING = 'rating'
+    METRIC_REVIEW_COUNT = 'review_count'
+    METRIC_CHOICES = (
+        (METRIC_RATING, 'Рейтинг'),
+        (METRIC_REVIEW_COUNT, 'Количество отзывов'),
+    )
+
+    scope = models.CharField(
+        'Область',
+        max_length=16,
+        choices=SCOPE_CHOICES,
+    )
+    scope_id = models.PositiveIntegerField(
+        'id категории или жанра',
+        default=0,
+    )
+    metric = models.CharField(
+        'Метрика',
+        max_length=16,
+        choices=METRIC_CHOICES,
+    )
+    position = models.PositiveSmallIntegerField('Позиция')
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='leaderboard_entries',
+        verbose_name='Произведение'
+    )
+    value = models.FloatField('Значение')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['scope', 'scope_id', 'metric', 'title'],
+                name='unique leaderboard title'
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=['scope', 'scope_id', 'metric', 'position'],
+                name='leaderboard_position_idx'
+            )
+        ]
+        ordering = ('scope', 'scope_id', 'metric', 'position')
+        verbose_name = 'позиция в рейтинге'
+        verbose_name_plural = 'Рейтинги лучших'
+
+    def __str__(self):
+        return f'{self.scope}:{self.scope_id} {self.metric} #{self.position}'
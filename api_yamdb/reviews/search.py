@@ -0,0 +1,149 @@
+"""Полнотекстовый поиск произведений по названию и описанию.
+
+На SQLite используется внешняя FTS5-таблица, синхронизируемая триггерами,
+на PostgreSQL - GIN-индекс по выражению to_tsvector. Миграции, которые
+пересоздают таблицу reviews_title на SQLite, удаляют триггеры: после
+migrate они создаются заново обработчиком post_migrate вместе с
+перестроением индекса.
+"""
+
+import re
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'reviews_title_fts'
+PG_INDEX = 'reviews_title_search_idx'
+TOKEN_RE = re.compile(r'\w+')
+
+
+def pg_vector_sql():
+    """Выражение tsvector, совпадающее с выражением индекса."""
+
+    config = settings.TITLE_SEARCH_CONFIG
+    return (
+        f"to_tsvector('{config}'::regconfig, "
+        "coalesce(reviews_title.name, '') || ' ' || "
+        "coalesce(reviews_title.description, ''))"
+    )
+
+
+SQLITE_TRIGGERS = (
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT "
+    f"ON reviews_title BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE "
+    f"ON reviews_title BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au "
+    f"AFTER UPDATE OF name, description ON reviews_title BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    f"INSERT INTO {FTS_TABLE}(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+)
+SQLITE_REBUILD = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+SQLITE_CREATE = (
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+    "name, description, content='reviews_title', content_rowid='id')",
+    *SQLITE_TRIGGERS,
+    SQLITE_REBUILD,
+)
+SQLITE_DROP = (
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+)
+
+
+def create_search_index(schema_editor):
+    """Создание полнотекстового индекса для текущей СУБД."""
+
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for sql in SQLITE_CREATE:
+            schema_editor.execute(sql)
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE INDEX {PG_INDEX} ON reviews_title '
+            f'USING GIN (({pg_vector_sql()}))'
+        )
+
+
+def drop_search_index(schema_editor):
+    """Удаление полнотекстового индекса."""
+
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for sql in SQLITE_DROP:
+            schema_editor.execute(sql)
+    elif vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {PG_INDEX}')
+
+
+def ensure_search_triggers(using='default'):
+    """Восстановление триггеров FTS5 после пересоздания reviews_title.
+
+    Если триггеров не хватает, индекс мог отстать от таблицы, поэтому после
+    их создания он перестраивается.
+    """
+
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT type, name FROM sqlite_master WHERE name LIKE %s",
+            [f'{FTS_TABLE}%'],
+        )
+        objects = set(cursor.fetchall())
+        if ('table', FTS_TABLE) not in objects:
+            return
+        triggers = {name for kind, name in objects if kind == 'trigger'}
+        if triggers >= {f'{FTS_TABLE}_{suffix}'
+                        for suffix in ('ai', 'ad', 'au')}:
+            return
+        for sql in SQLITE_TRIGGERS:
+            cursor.execute(sql)
+        cursor.execute(SQLITE_REBUILD)
+
+
+def search_titles(queryset, text):
+    """Отбор произведений по запросу с сортировкой по релевантности."""
+
+    tokens = TOKEN_RE.findall(text)
+    if not tokens:
+        return queryset.none()
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        match = ' '.join(f'"{token}"' for token in tokens)
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            [match],
+        )).annotate(search_rank=RawSQL(
+            f'SELECT bm25({FTS_TABLE}) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s '
+            f'AND {FTS_TABLE}.rowid = reviews_title.id',
+            [match], output_field=FloatField(),
+        )).order_by('search_rank', 'name')
+    if vendor == 'postgresql':
+        config = settings.TITLE_SEARCH_CONFIG
+        query = f"plainto_tsquery('{config}'::regconfig, %s)"
+        text = ' '.join(tokens)
+        return queryset.filter(RawSQL(
+            f'{pg_vector_sql()} @@ {query}', [text],
+            output_field=BooleanField(),
+        )).annotate(search_rank=RawSQL(
+            f'ts_rank({pg_vector_sql()}, {query})', [text],
+            output_field=FloatField(),
+        )).order_by('-search_rank', 'name')
+    for token in tokens:
+        queryset = queryset.filter(
+            Q(name__icontains=token) | Q(description__icontains=token)
+        )
+    return queryset
@@ -0,0 +1,154 @@
+"""Сигналы приложения reviews."""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from . import histogram, leaderboard
+from .models import (Category, Genre, LeaderboardEntry, Review, Title,
+                     TitleScoreHistogram)
+
+
+def update_leaderboards(*title_ids):
+    for title_id in title_ids:
+        transaction.on_commit(partial(leaderboard.update_title, title_id))
+
+
+def rebuild_leaderboards(scopes):
+    if scopes:
+        transaction.on_commit(partial(leaderboard.rebuild_scopes, scopes))
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, **kwargs):
+    """Учёт новой или изменённой оценки в рейтинге произведения."""
+
+    if created:
+        Title.objects.filter(pk=instance.title_id).shift_rating(
+            instance.score, 1
+        )
+        histogram.shift(instance.title_id, {instance.score: 1})
+        update_leaderboards(instance.title_id)
+    else:
+        loaded_title_id = getattr(instance, '_loaded_title_id', None)
+        loaded_score = getattr(instance, '_loaded_score', None)
+        if loaded_score is None or loaded_title_id is None:
+            Title.objects.filter(pk=instance.title_id).recalculate_rating()
+            histogram.rebuild([instance.title_id])
+            update_leaderboards(instance.title_id)
+        elif loaded_title_id != instance.title_id:
+            Title.objects.filter(pk=loaded_title_id).shift_rating(
+                -loaded_score, -1
+            )
+            Title.objects.filter(pk=instance.title_id).shift_rating(
+                instance.score, 1
+            )
+            histogram.shift(loaded_title_id, {loaded_score: -1})
+            histogram.shift(instance.title_id, {instance.score: 1})
+            update_leaderboards(loaded_title_id, instance.title_id)
+        elif loaded_score != instance.score:
+            Title.objects.filter(pk=instance.title_id).shift_rating(
+                instance.score - loaded_score, 0
+            )
+            histogram.shift(
+                instance.title_id, {loaded_score: -1, instance.score: 1}
+            )
+            update_leaderboards(instance.title_id)
+        else:
+            Title.objects.filter(pk=instance.title_id).touch()
+    instance._loaded_score = instance.score
+    instance._loaded_title_id = instance.title_id
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    """Исключение удалённой оценки из рейтинга произведения.
+
+    Срабатывает и при каскадном удалении отзывов вместе с автором или
+    произведением.
+    """
+
+    Title.objects.filter(pk=instance.title_id).shift_rating(
+        -instance.score, -1
+    )
+    histogram.shift(instance.title_id, {instance.score: -1})
+    update_leaderboards(instance.title_id)
+
+
+@receiver(post_save, sender=Title)
+def touch_title_on_save(sender, instance, created, **kwargs):
+    """Новая версия произведения при его изменении.
+
+    Для нового произведения создаётся пустое распределение оценок, при
+    смене категории пересобираются рейтинги старой и новой категорий.
+    """
+
+    Title.objects.filter(pk=instance.pk).touch()
+    if created:
+        TitleScoreHistogram.objects.create(title=instance)
+    loaded_category_id = getattr(instance, '_loaded_category_id', None)
+    if not created and loaded_category_id != instance.category_id:
+        rebuild_leaderboards({
+            ('category', category_id)
+            for category_id in (loaded_category_id, instance.category_id)
+            if category_id is not None
+        })
+    instance._loaded_category_id = instance.category_id
+
+
+@receiver(pre_delete, sender=Title)
+def rebuild_leaderboards_on_title_delete(sender, instance, **kwargs):
+    """Заполнение освободившихся позиций рейтингов после удаления."""
+
+    rebuild_leaderboards(leaderboard.get_title_scopes([instance.pk]))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_title_on_genre_change(sender, instance, action, reverse, pk_set,
+                                **kwargs):
+    """Новая версия произведений при изменении их жанров."""
+
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        Title.objects.filter(pk=instance.pk).touch()
+        genre_ids = (
+            instance.genre.values_list('pk', flat=True)
+            if action == 'pre_clear' else pk_set
+        )
+        rebuild_leaderboards({('genre', pk) for pk in genre_ids})
+        return
+    if action == 'pre_clear':
+        Title.objects.filter(genre=instance).touch()
+    else:
+        Title.objects.filter(pk__in=pk_set).touch()
+    rebuild_leaderboards({('genre', instance.pk)})
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def touch_titles_on_category_change(sender, instance, **kwargs):
+    """Новая версия произведений при изменении или удалении категории."""
+
+    Title.objects.filter(category=instance).touch()
+
+
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def touch_titles_on_genre_write(sender, instance, **kwargs):
+    """Новая версия произведений при изменении или удалении жанра."""
+
+    Title.objects.filter(genre=instance).touch()
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+def delete_leaderboards(sender, instance, **kwargs):
+    """Удаление рейтингов удалённой категории или жанра."""
+
+    LeaderboardEntry.objects.filter(
+        scope=sender._meta.model_name, scope_id=instance.pk
+    ).delete()
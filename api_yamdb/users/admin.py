@@ -2,7 +2,7 @@
 
 from django.contrib import admin
 
-from .models import User
+from .models import OutgoingEmail, User
 
 
 class UserAdmin(admin.ModelAdmin):
@@ -21,4 +21,20 @@ class UserAdmin(admin.ModelAdmin):
     list_display_links = ('username',)
 
 
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    """Представление модели OutgoingEmail."""
+
+    list_display = ('id',
+                    'to',
+                    'subject',
+                    'created_at',
+                    'sent_at',
+                    'attempts',
+                    )
+    search_fields = ('to',)
+    list_filter = ('sent_at',)
+    list_display_links = ('id',)
+
+
 admin.site.register(User, UserAdmin)
+admin.site.register(OutgoingEmail, OutgoingEmailAdmin)
@@ -0,0 +1,43 @@
+"""Рассылка писем из очереди исходящих сообщений."""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.outbox import send_pending
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди исходящих сообщений.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help='Количество писем, отправляемых через одно соединение.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1.0,
+            help='Пауза в секундах между проверками пустой очереди.'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Отправить накопившиеся письма и завершить работу.'
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            sent = send_pending(batch_size=options['batch_size'])
+            total += sent
+            if sent:
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(f'Отправлено писем: {total}'))
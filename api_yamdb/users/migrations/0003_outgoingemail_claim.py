@@ -0,0 +1,23 @@
+# Generated by Django 3.2 on 2026-10-18 04:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_outgoingemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outgoingemail',
+            name='claim_token',
+            field=models.UUIDField(blank=True, null=True, verbose_name='Метка отправляющего процесса'),
+        ),
+        migrations.AddField(
+            model_name='outgoingemail',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Дата захвата для отправки'),
+        ),
+    ]
@@ -84,3 +84,57 @@ class User(AbstractUser):
 
     def str(self):
         return self.username
+
+
+class OutgoingEmail(models.Model):
+    """Очередь исходящих писем."""
+
+    subject = models.CharField(
+        'Тема',
+        max_length=settings.FIELD_NAME_LENGTH,
+    )
+    body = models.TextField('Текст')
+    from_email = models.EmailField(
+        'Отправитель',
+        max_length=settings.EMAIL_MAX_LENGTH,
+    )
+    to = models.EmailField(
+        'Получатель',
+        max_length=settings.EMAIL_MAX_LENGTH,
+    )
+    created_at = models.DateTimeField(
+        'Дата постановки в очередь',
+        auto_now_add=True,
+    )
+    sent_at = models.DateTimeField(
+        'Дата отправки',
+        null=True,
+        blank=True,
+        db_index=True,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        'Попытки отправки',
+        default=0,
+    )
+    last_error = models.TextField(
+        'Последняя ошибка',
+        blank=True,
+    )
+    claim_token = models.UUIDField(
+        'Метка отправляющего процесса',
+        null=True,
+        blank=True,
+    )
+    claimed_at = models.DateTimeField(
+        'Дата захвата для отправки',
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        verbose_name = 'исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('created_at',)
+
+    def __str__(self):
+        return f'{self.to}: {self.subject}'
@@ -0,0 +1,164 @@
+"""Отложенная отправка писем через таблицу исходящих сообщений."""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+OUTBOX_MODE_IMMEDIATE = 'immediate'
+OUTBOX_MODE_THREAD = 'thread'
+OUTBOX_MODE_COMMAND = 'command'
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def get_executor():
+    """Пул потоков фоновой отправки, создаётся при первом обращении."""
+
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.EMAIL_OUTBOX_WORKERS,
+            thread_name_prefix='email-outbox',
+        )
+    return _executor
+
+
+def pending_emails():
+    """Письма, ожидающие отправки."""
+
+    return OutgoingEmail.objects.filter(
+        sent_at__isnull=True,
+        attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    )
+
+
+def claim_emails(queryset, batch_size):
+    """Захват пачки писем для отправки текущим процессом.
+
+    Письма помечаются меткой в короткой транзакции условным UPDATE, поэтому
+    два процесса не получают одни и те же письма и на базах без
+    SELECT ... FOR UPDATE. Захват упавшего процесса истекает через
+    EMAIL_OUTBOX_CLAIM_TIMEOUT секунд.
+    """
+
+    token = uuid4()
+    now = timezone.now()
+    available = queryset.filter(
+        Q(claimed_at__isnull=True)
+        | Q(claimed_at__lt=now - timedelta(
+            seconds=settings.EMAIL_OUTBOX_CLAIM_TIMEOUT
+        ))
+    )
+    with transaction.atomic():
+        ids = list(available.select_for_update(skip_locked=True).values_list(
+            'pk', flat=True
+        )[:batch_size])
+        if not ids:
+            return []
+        available.filter(pk__in=ids).update(claim_token=token, claimed_at=now)
+    return list(OutgoingEmail.objects.filter(claim_token=token))
+
+
+def release_emails(emails):
+    """Снятие захвата с писем, которые не удалось отправить."""
+
+    OutgoingEmail.objects.filter(
+        pk__in=[email.pk for email in emails]
+    ).update(claim_token=None, claimed_at=None)
+
+
+def send_pending(batch_size=None, queryset=None):
+    """Отправка пачки писем через одно соединение с почтовым сервером.
+
+    Письма захватываются в отдельной транзакции и отправляются вне её,
+    так что сетевой обмен с почтовым сервером не удерживает блокировки БД.
+    Возвращает количество успешно отправленных писем.
+    """
+
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    queryset = pending_emails() if queryset is None else queryset
+    emails = claim_emails(queryset, batch_size)
+    if not emails:
+        return 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except OSError:
+        logger.exception('Почтовый сервер недоступен.')
+        release_emails(emails)
+        return 0
+    sent, failed = [], []
+    try:
+        for email in emails:
+            message = EmailMessage(
+                email.subject,
+                email.body,
+                email.from_email,
+                (email.to,),
+                connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as error:
+                email.attempts += 1
+                email.last_error = str(error)
+                failed.append(email)
+            else:
+                sent.append(email)
+    finally:
+        connection.close()
+    with transaction.atomic():
+        OutgoingEmail.objects.filter(
+            pk__in=[email.pk for email in sent]
+        ).update(sent_at=timezone.now(), claim_token=None, claimed_at=None)
+        for email in failed:
+            email.claim_token = email.claimed_at = None
+        OutgoingEmail.objects.bulk_update(
+            failed, ('attempts', 'last_error', 'claim_token', 'claimed_at')
+        )
+    return len(sent)
+
+
+def _flush_in_thread():
+    """Отправка очереди из фонового потока."""
+
+    try:
+        while send_pending():
+            pass
+    finally:
+        close_old_connections()
+
+
+def enqueue_email(subject, body, to):
+    """Постановка письма в очередь.
+
+    В режиме ``immediate`` письмо отправляется сразу, в режиме ``thread``
+    отправка уходит в пул потоков после фиксации транзакции, в режиме
+    ``command`` письма рассылает команда ``send_outbox``.
+    """
+
+    email = OutgoingEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=settings.AUTH_EMAIL,
+        to=to,
+    )
+    mode = settings.EMAIL_OUTBOX_MODE
+    if mode == OUTBOX_MODE_IMMEDIATE:
+        send_pending(queryset=pending_emails().filter(pk=email.pk))
+    elif mode == OUTBOX_MODE_THREAD:
+        transaction.on_commit(
+            lambda: get_executor().submit(_flush_in_thread)
+        )
+    return email
@@ -0,0 +1,119 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08RatingAPI:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_changes(self, admin_client,
+                                              user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review = create_single_review(
+            admin_client, title_id, 'Админ', 2
+        ).json()
+        create_single_review(user_client, title_id, 'Пользователь', 8)
+        assert self.get_rating(admin_client, title_id) == 5, (
+            'Рейтинг произведения должен учитывать новые отзывы.'
+        )
+
+        review_url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review['id']
+        )
+        admin_client.patch(review_url, data={'score': 6})
+        assert self.get_rating(admin_client, title_id) == 7, (
+            'Рейтинг произведения должен учитывать изменение оценки.'
+        )
+
+        admin_client.delete(review_url)
+        assert self.get_rating(admin_client, title_id) == 8, (
+            'Рейтинг произведения должен учитывать удаление отзыва.'
+        )
+
+    def test_02_rating_on_author_cascade_delete(self, admin_client,
+                                                user_client, user):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Пользователь', 10)
+        user.delete()
+        assert self.get_rating(admin_client, title_id) is None, (
+            'Рейтинг произведения должен сбрасываться при каскадном '
+            'удалении последнего отзыва вместе с автором.'
+        )
+
+    def test_03_recalculate_ratings_command(self, admin_client, user_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Пользователь', 3)
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+        call_command('recalculate_ratings')
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            3, 1, 3.0
+        ), (
+            'Команда `recalculate_ratings` должна восстанавливать рейтинг '
+            'по таблице отзывов.'
+        )
+
+    def test_04_review_and_rating_saved_atomically(self, admin_client,
+                                                   user_client, monkeypatch):
+        from reviews import histogram
+        from reviews.models import Review, Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review = create_single_review(user_client, title_id, 'Отзыв', 4)
+
+        def fail(*args, **kwargs):
+            raise RuntimeError('Сбой после записи отзыва.')
+
+        monkeypatch.setattr(histogram, 'shift', fail)
+        review_url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review.json()['id']
+        )
+        for method, args in ((admin_client.post, (
+                f'/api/v1/titles/{title_id}/reviews/',
+                {'text': 'Отзыв', 'score': 10})),
+                (user_client.patch, (review_url, {'score': 9})),
+                (user_client.delete, (review_url,))):
+            with pytest.raises(RuntimeError):
+                method(*args)
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (4, 1), (
+            'Отзыв и рейтинг произведения должны сохраняться в одной '
+            'транзакции.'
+        )
+        assert list(Review.objects.values_list('score', flat=True)) == [4]
+
+    def test_05_service_fields_are_not_filters(self, admin_client,
+                                               user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 4)
+        for param in ('version', 'rating', 'rating_sum', 'rating_count',
+                      'modified'):
+            response = user_client.get('/api/v1/titles/', {param: 999})
+            assert response.status_code == HTTPStatus.OK
+            assert response.json()['count'] == len(titles), (
+                f'Служебное поле `{param}` не должно быть фильтром списка '
+                'произведений.'
+            )
+        response = user_client.get('/api/v1/titles/', {'year': 1984})
+        assert response.json()['count'] == 1
@@ -0,0 +1,142 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+SMALL_PAGE = 2
+LARGE_PAGE = 20
+
+
+def seed_catalog(django_user_model, size):
+    from reviews.models import Category, Comments, Genre, Review, Title
+
+    category = Category.objects.create(
+        name=f'Категория {size}', slug=f'category-{size}'
+    )
+    genres = [
+        Genre.objects.create(name=f'Жанр {idx}', slug=f'genre{size}-{idx}')
+        for idx in range(3)
+    ]
+    authors = [
+        django_user_model.objects.create(
+            username=f'author{size}-{idx}',
+            email=f'author{size}-{idx}@yamdb.fake'
+        )
+        for idx in range(size)
+    ]
+    titles = []
+    for idx in range(size):
+        title = Title.objects.create(
+            name=f'Произведение {size}-{idx}', year=2000, category=category
+        )
+        title.genre.set(genres)
+        titles.append(title)
+    reviews = [
+        Review.objects.create(
+            title=titles[0], author=author, text='Отзыв', score=5
+        )
+        for author in authors
+    ]
+    for author in authors:
+        Comments.objects.create(
+            review=reviews[0], author=author, text='Комментарий'
+        )
+    return titles[0], reviews[0]
+
+
+ENDPOINTS = (
+    ('/api/v1/categories/', 2),
+    ('/api/v1/genres/', 2),
+    ('/api/v1/titles/?limit={size}', 3),
+    ('/api/v1/titles/?genre=genre{size}-1&limit={size}', 3),
+    ('/api/v1/titles/{title_id}/', 3),
+    ('/api/v1/titles/{title_id}/reviews/?limit={size}', 3),
+    ('/api/v1/titles/{title_id}/reviews/{review_id}/', 3),
+    (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        '?limit={size}',
+        2
+    ),
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryCount:
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'GET-запрос к `{url}` должен возвращать ответ со статусом 200.'
+        )
+        return len(context.captured_queries)
+
+    @pytest.mark.parametrize('url_template,max_queries', ENDPOINTS)
+    def test_01_query_count_is_constant(self, client, django_user_model,
+                                        url_template, max_queries):
+        counts = []
+        for size in (SMALL_PAGE, LARGE_PAGE):
+            title, review = seed_catalog(django_user_model, size)
+            url = url_template.format(
+                size=size, title_id=title.id, review_id=review.id
+            )
+            counts.append(self.count_queries(client, url))
+        assert counts[0] == counts[1], (
+            f'Количество запросов к БД для `{url_template}` не должно '
+            f'зависеть от размера страницы: {counts}.'
+        )
+        assert counts[1] <= max_queries, (
+            f'GET-запрос к `{url_template}` выполняет {counts[1]} запросов '
+            f'к БД, ожидалось не более {max_queries}.'
+        )
+
+    def test_02_comment_create_loads_parent_once(self, user_client,
+                                                 django_user_model):
+        title, review = seed_catalog(django_user_model, SMALL_PAGE)
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == HTTPStatus.CREATED
+        parent_lookups = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_review"' in query['sql']
+        ]
+        assert len(parent_lookups) <= 1, (
+            'При создании комментария отзыв должен запрашиваться из БД не '
+            f'более одного раза, сейчас: {len(parent_lookups)}.'
+        )
+
+    def test_03_signup_and_token_resolve_user_once(self, client,
+                                                   django_user_model):
+        from django.contrib.auth.tokens import default_token_generator
+
+        data = {'email': 'signup@yamdb.fake', 'username': 'signup_user'}
+        for attempt in ('первом', 'повторном'):
+            with CaptureQueriesContext(connection) as context:
+                response = client.post('/api/v1/auth/signup/', data=data)
+            assert response.status_code == HTTPStatus.OK
+            user_selects = [
+                query for query in context.captured_queries
+                if query['sql'].startswith('SELECT')
+                and 'FROM "users_user"' in query['sql']
+            ]
+            assert len(user_selects) == 1, (
+                f'При {attempt} запросе к `/api/v1/auth/signup/` '
+                'пользователь должен запрашиваться из БД одним запросом, '
+                f'сейчас: {len(user_selects)}.'
+            )
+
+        user = django_user_model.objects.get(username=data['username'])
+        token_data = {
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user)
+        }
+        with CaptureQueriesContext(connection) as context:
+            response = client.post('/api/v1/auth/token/', data=token_data)
+        assert response.status_code == HTTPStatus.OK
+        assert len(context.captured_queries) == 1, (
+            'Запрос к `/api/v1/auth/token/` должен выполнять один запрос к '
+            f'БД, сейчас: {len(context.captured_queries)}.'
+        )
@@ -0,0 +1,112 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_signup_enqueues_email(self, client, settings):
+        from users.models import OutgoingEmail
+
+        settings.EMAIL_OUTBOX_MODE = 'command'
+        outbox_before_count = len(mail.outbox)
+        valid_data = {
+            'email': 'queued@yamdb.fake',
+            'username': 'queued_username'
+        }
+        response = client.post(self.URL_SIGNUP, data=valid_data)
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == outbox_before_count, (
+            'В режиме `command` письмо не должно отправляться во время '
+            'обработки запроса.'
+        )
+        queued = OutgoingEmail.objects.get(to=valid_data['email'])
+        assert queued.sent_at is None
+
+        call_command('send_outbox', once=True)
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Команда `send_outbox` должна отправлять письма из очереди.'
+        )
+        assert valid_data['email'] in mail.outbox[-1].to
+        queued.refresh_from_db()
+        assert queued.sent_at is not None, (
+            'Отправленное письмо должно помечаться датой отправки.'
+        )
+
+        call_command('send_outbox', once=True)
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Повторный запуск `send_outbox` не должен отправлять письма '
+            'повторно.'
+        )
+
+    def test_02_failed_email_stays_in_queue(self, settings):
+        from users.models import OutgoingEmail
+        from users.outbox import enqueue_email, send_pending
+
+        settings.EMAIL_OUTBOX_MODE = 'command'
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+        settings.EMAIL_HOST = 'localhost'
+        settings.EMAIL_PORT = 1
+        email = enqueue_email('Тема', 'Текст', 'fail@yamdb.fake')
+        assert send_pending() == 0, (
+            'При недоступном почтовом сервере письма не должны считаться '
+            'отправленными.'
+        )
+        email.refresh_from_db()
+        assert email.sent_at is None
+        assert OutgoingEmail.objects.filter(sent_at__isnull=True).exists()
+
+    def test_03_claimed_emails_are_not_sent_twice(self, settings):
+        from users.outbox import claim_emails, enqueue_email, pending_emails
+
+        settings.EMAIL_OUTBOX_MODE = 'command'
+        for idx in range(3):
+            enqueue_email('Тема', 'Текст', f'claim{idx}@yamdb.fake')
+        claimed = claim_emails(pending_emails(), 2)
+        assert len(claimed) == 2
+        assert not {email.pk for email in claimed} & {
+            email.pk for email in claim_emails(pending_emails(), 10)
+        }, 'Захваченные письма не должны выдаваться другому процессу.'
+
+        outbox_before_count = len(mail.outbox)
+        call_command('send_outbox', once=True)
+        assert len(mail.outbox) == outbox_before_count, (
+            'Письма, захваченные другим процессом, не должны отправляться.'
+        )
+        settings.EMAIL_OUTBOX_CLAIM_TIMEOUT = -1
+        call_command('send_outbox', once=True)
+        assert len(mail.outbox) == outbox_before_count + 3, (
+            'Письма с истёкшим захватом должны отправляться повторно.'
+        )
+
+    def test_04_thread_mode(self, settings, monkeypatch):
+        from concurrent.futures import ThreadPoolExecutor
+
+        from users import outbox
+        from users.models import OutgoingEmail
+
+        settings.EMAIL_OUTBOX_MODE = 'command'
+        for idx in range(5):
+            outbox.enqueue_email('Тема', 'Текст', f'thread{idx}@yamdb.fake')
+        # Общая in-memory база SQLite тестов сразу возвращает ошибку
+        # блокировки при параллельной записи, поэтому пул из одного потока;
+        # захват писем параллельными процессами проверяется в test_03.
+        executor = ThreadPoolExecutor(max_workers=1)
+        monkeypatch.setattr(outbox, '_executor', executor)
+        settings.EMAIL_OUTBOX_MODE = 'thread'
+        settings.EMAIL_OUTBOX_BATCH_SIZE = 2
+        outbox_before_count = len(mail.outbox)
+        outbox.enqueue_email('Тема', 'Текст', 'thread5@yamdb.fake')
+        executor.submit(outbox._flush_in_thread)
+        executor.shutdown(wait=True)
+        assert sorted(
+            email.to[0] for email in mail.outbox[outbox_before_count:]
+        ) == [f'thread{idx}@yamdb.fake' for idx in range(6)], (
+            'В режиме `thread` каждое письмо должно отправляться один раз.'
+        )
+        assert not OutgoingEmail.objects.filter(sent_at__isnull=True).exists()
@@ -0,0 +1,105 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from tests.utils import create_titles
+
+def user_queries(context):
+    return [
+        query for query in context.captured_queries
+        if 'FROM "users_user"' in query['sql']
+    ]
+
+
+@pytest.fixture
+def stateless_auth(monkeypatch):
+    from rest_framework.views import APIView
+
+    from api.authentication import StatelessJWTAuthentication
+
+    monkeypatch.setattr(
+        APIView, 'authentication_classes', [StatelessJWTAuthentication]
+    )
+
+
+def claims_client(user):
+    from api.authentication import UserClaimsAccessToken
+
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {UserClaimsAccessToken.for_user(user)}'
+    )
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11StatelessJWT:
+
+    def test_01_token_contains_user_claims(self, client, user):
+        from django.contrib.auth.tokens import default_token_generator
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        response = client.post('/api/v1/auth/token/', data={
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user)
+        })
+        assert response.status_code == HTTPStatus.OK
+        token = AccessToken(response.json()['token'])
+        assert token['role'] == user.role
+        assert token['username'] == user.username
+        assert token['is_superuser'] == user.is_superuser
+
+    def test_02_requests_skip_user_lookup(self, stateless_auth, admin,
+                                          user):
+        admin_client = claims_client(admin)
+        titles, _, _ = create_titles(admin_client)
+        user_client = claims_client(user)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = user_client.post(url, data={'text': 'Ок', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert not user_queries(context), (
+            'При stateless-аутентификации пользователь не должен '
+            'загружаться из БД для чтения.'
+        )
+
+        response = user_client.delete('/api/v1/genres/comedy/')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Права доступа должны проверяться по роли из токена.'
+        )
+
+    def test_03_full_user_fallback(self, stateless_auth, user):
+        with CaptureQueriesContext(connection) as context:
+            response = claims_client(user).get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['bio'] == user.bio
+        assert user_queries(context), (
+            'Эндпоинты из JWT_FULL_USER_ENDPOINTS должны получать '
+            'пользователя из БД.'
+        )
+
+    def test_04_writes_check_current_user(self, stateless_auth, admin,
+                                          user):
+        admin_client = claims_client(admin)
+        user_client = claims_client(user)
+        admin.role = 'user'
+        admin.save()
+        response = admin_client.delete('/api/v1/genres/comedy/')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Изменяющие запросы должны проверять текущую роль из БД.'
+        )
+        user.is_active = False
+        user.save()
+        response = user_client.post(
+            '/api/v1/categories/', data={'name': 'Новая', 'slug': 'new'}
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Изменяющие запросы заблокированного пользователя должны '
+            'отклоняться.'
+        )
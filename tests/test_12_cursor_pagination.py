@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def seed_reviews(django_user_model, count):
+    from reviews.models import Review, Title
+
+    title = Title.objects.create(name='Произведение', year=2000)
+    for idx in range(count):
+        author = django_user_model.objects.create(
+            username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+        )
+        Review.objects.create(
+            title=title, author=author, text=f'Отзыв {idx}', score=5
+        )
+    return title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12CursorPagination:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_cursor_walks_all_reviews(self, client, django_user_model):
+        from reviews.models import Review
+
+        title = seed_reviews(django_user_model, 7)
+        Review.objects.filter(id__in=Review.objects.values('id')[:4]).update(
+            pub_date=Review.objects.first().pub_date
+        )
+        expected = list(
+            Review.objects.order_by('-pub_date', '-id')
+            .values_list('id', flat=True)
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        url = f'{url}?cursor=&limit=3'
+        seen = []
+        pages = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Постраничный вывод по курсору не должен считать общее '
+                'количество объектов.'
+            )
+            pages.append(data)
+            seen.extend(review['id'] for review in data['results'])
+            url = data['next']
+        assert seen == expected, (
+            'Постраничный вывод по курсору должен возвращать все отзывы в '
+            'порядке `-pub_date`, `-id` без пропусков и повторов.'
+        )
+
+        response = client.get(pages[-1]['previous'])
+        assert [review['id'] for review in response.json()['results']] == (
+            [review['id'] for review in pages[-2]['results']]
+        ), 'Ссылка `previous` должна вести на предыдущую страницу.'
+
+    def test_02_cursor_page_cost_is_constant(self, client,
+                                             django_user_model):
+        title = seed_reviews(django_user_model, 12)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        counts = []
+        next_url = f'{url}?cursor=&limit=2'
+        for _ in range(4):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(next_url)
+            counts.append(len(context.captured_queries))
+            next_url = response.json()['next']
+        assert counts == [2] * len(counts), (
+            'Каждая страница по курсору должна выполняться одним запросом '
+            'к отзывам и одним запросом версии произведения, сейчас: '
+            f'{counts}.'
+        )
+
+    def test_03_invalid_cursor(self, client, django_user_model):
+        title = seed_reviews(django_user_model, 1)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        response = client.get(f'{url}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,80 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+def count_queries(context):
+    return [
+        query for query in context.captured_queries
+        if 'COUNT(' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13CountCache:
+
+    TITLES_URL = '/api/v1/titles/?genre=drama'
+
+    def test_01_count_is_cached_until_write(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = client.get(self.TITLES_URL)
+        assert response.json()['count'] == 1
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.TITLES_URL)
+        assert response.json()['count'] == 1
+        assert not count_queries(context), (
+            'Повторный запрос списка с теми же фильтрами не должен '
+            'выполнять COUNT.'
+        )
+
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Новое произведение',
+            'year': 2000,
+            'genre': [genres[2]['slug']],
+            'category': categories[0]['slug'],
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        response = client.get(self.TITLES_URL)
+        assert response.json()['count'] == 2, (
+            'Закешированное количество объектов должно сбрасываться при '
+            'записи в таблицы, участвующие в запросе.'
+        )
+
+    def test_02_genre_unlink_invalidates_count(self, client, admin_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        assert client.get(self.TITLES_URL).json()['count'] == 1
+        Title.objects.get(pk=titles[1]['id']).genre.clear()
+        assert client.get(self.TITLES_URL).json()['count'] == 0
+
+    def test_03_bounded_count_above_threshold(self, client, admin_client,
+                                              settings):
+        settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD = 1
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 2, (
+            'Без оценки по плану запроса должно возвращаться количество, '
+            'ограниченное порогом подсчёта.'
+        )
+
+    def test_04_signals_allow_fast_delete(self):
+        from django.contrib.sessions.models import Session
+        from django.db.models.deletion import Collector
+
+        from reviews.models import (LeaderboardEntry, Title,
+                                    TitleScoreHistogram)
+
+        collector = Collector(using='default')
+        for model in (LeaderboardEntry, TitleScoreHistogram,
+                      Title.genre.through, Session):
+            assert collector.can_fast_delete(model.objects.all()), (
+                f'Удаление {model.__name__} не должно вызывать сигналы '
+                'сброса кеша.'
+            )
@@ -0,0 +1,35 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ImportCSV:
+
+    def test_01_import_static_data(self):
+        from reviews.models import Comments, Genre, Review, Title
+        from users.models import User
+
+        call_command('import_csv', batch_size=10)
+        assert User.objects.count() == 5
+        assert Genre.objects.count() == 15
+        assert Title.objects.count() == 32
+        assert Title.genre.through.objects.count() == 42
+        assert Review.objects.count() == 72
+        assert Comments.objects.count() == 3
+
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Дата публикации должна загружаться из файла, а не '
+            'устанавливаться текущей.'
+        )
+        title = Title.objects.get(pk=review.title_id)
+        assert title.rating_count == title.reviews.count(), (
+            'После загрузки отзывов рейтинг произведений должен быть '
+            'пересчитан.'
+        )
+
+    def test_02_unknown_table(self):
+        from django.core.management.base import CommandError
+
+        with pytest.raises(CommandError):
+            call_command('import_csv', 'unknown')
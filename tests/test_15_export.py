@@ -0,0 +1,92 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+
+def read_static_csv(name):
+    with open(f'api_yamdb/static/data/{name}.csv', encoding='utf-8',
+              newline='') as file:
+        return sorted(csv.DictReader(file), key=lambda row: int(row['id']))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15Export:
+
+    def test_01_export_endpoint(self, admin_client, user_client):
+        call_command('import_csv')
+        url = '/api/v1/export/review.csv'
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+            'Выгрузка данных должна быть доступна только администратору.'
+        )
+
+        response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming
+        content = b''.join(response.streaming_content).decode()
+        exported = list(csv.DictReader(io.StringIO(content)))
+        assert exported == read_static_csv('review'), (
+            'Выгрузка отзывов в CSV должна совпадать с файлом '
+            '`static/data/review.csv`.'
+        )
+
+        response = admin_client.get('/api/v1/export/comments.ndjson')
+        assert response.status_code == HTTPStatus.OK
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        expected = read_static_csv('comments')
+        assert [json.loads(line) for line in lines] == [
+            {**row, 'id': int(row['id']), 'review_id': int(row['review_id']),
+             'author': int(row['author'])}
+            for row in expected
+        ]
+
+        response = admin_client.get('/api/v1/export/unknown.csv')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_export_command(self, tmp_path):
+        call_command('import_csv')
+        output = tmp_path / 'genre_title.csv'
+        call_command('export', 'genre_title', output=str(output))
+        with open(output, encoding='utf-8', newline='') as file:
+            assert list(csv.DictReader(file)) == read_static_csv(
+                'genre_title'
+            )
+
+    def test_03_round_trip(self, tmp_path):
+        from api.datasets import TABLES
+
+        call_command('import_csv')
+        first, second = tmp_path / 'first', tmp_path / 'second'
+        first.mkdir()
+        second.mkdir()
+        for name, _, _ in TABLES:
+            call_command('export', name, output=str(first / f'{name}.csv'))
+            with open(first / f'{name}.csv', encoding='utf-8',
+                      newline='') as file:
+                reader = csv.DictReader(file)
+                rows = list(reader)
+            static = read_static_csv(name)
+            assert reader.fieldnames[:len(static[0])] == list(static[0]), (
+                f'Столбцы выгрузки {name} должны совпадать с файлом '
+                'static/data.'
+            )
+            if name == 'titles':
+                assert reader.fieldnames[-1] == 'description'
+                rows = [
+                    {column: value for column, value in row.items()
+                     if column != 'description'}
+                    for row in rows
+                ]
+            assert rows == static
+
+        for _, model, _ in reversed(TABLES):
+            model.objects.all().delete()
+        call_command('import_csv', path=first)
+        for name, _, _ in TABLES:
+            call_command('export', name, output=str(second / f'{name}.csv'))
+            assert (second / f'{name}.csv').read_text(encoding='utf-8') == (
+                (first / f'{name}.csv').read_text(encoding='utf-8')
+            ), f'Выгрузка {name} должна загружаться без изменений.'
@@ -0,0 +1,148 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TitlesBulk:
+
+    URL = '/api/v1/titles/bulk/'
+
+    def test_01_bulk_create_and_update(self, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        data = [
+            {
+                'name': f'Произведение {idx}',
+                'year': 2000 + idx,
+                'category': categories[0]['slug'],
+                'genre': [genres[0]['slug'], genres[2]['slug']],
+            }
+            for idx in range(20)
+        ]
+        data.append({'name': 'Без жанра', 'year': 2000,
+                     'category': categories[0]['slug'], 'genre': []})
+        data.append({'name': 'Чужая категория', 'year': 2000,
+                     'category': 'unknown', 'genre': [genres[0]['slug']]})
+        data.append({'id': titles[0]['id'], 'name': 'Новое название',
+                     'genre': [genres[1]['slug']]})
+        data.append({'id': 999999, 'name': 'Нет такого'})
+
+        response = admin_client.post(self.URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()
+        assert len(results) == len(data), (
+            'Ответ пакетной записи должен содержать результат для каждого '
+            'элемента запроса.'
+        )
+        for result, item in zip(results[:20], data[:20]):
+            assert result['name'] == item['name']
+            assert sorted(genre['slug'] for genre in result['genre']) == (
+                sorted(item['genre'])
+            )
+        assert 'genre' in results[20]['errors']
+        assert 'category' in results[21]['errors']
+        assert results[22]['name'] == 'Новое название'
+        assert [genre['slug'] for genre in results[22]['genre']] == (
+            [genres[1]['slug']]
+        )
+        assert results[22]['category']['slug'] == categories[0]['slug']
+        assert 'id' in results[23]['errors']
+
+        response = admin_client.get('/api/v1/titles/')
+        assert response.json()['count'] == len(titles) + 20
+
+    def test_02_bulk_permissions(self, user_client, client):
+        response = user_client.post(self.URL, data=[], format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        response = client.post(
+            self.URL, data='[]', content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_03_bulk_query_count(self, admin_client):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        _, categories, genres = create_titles(admin_client)
+        counts = []
+        for size in (5, 50):
+            data = [
+                {'name': f'Пакет {size}-{idx}', 'year': 2000,
+                 'category': categories[1]['slug'],
+                 'genre': [genre['slug'] for genre in genres]}
+                for idx in range(size)
+            ]
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.post(
+                    self.URL, data=data, format='json'
+                )
+            assert response.status_code == HTTPStatus.OK
+            counts.append(len(context.captured_queries))
+        assert counts[0] == counts[1], (
+            'Количество запросов не должно зависеть от размера пакета: '
+            f'{counts}.'
+        )
+
+    def test_04_duplicate_genres(self, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        slug = genres[0]['slug']
+        response = admin_client.post(self.URL, data=[
+            {'name': 'Повтор жанра', 'year': 2000,
+             'category': categories[0]['slug'],
+             'genre': [slug, slug.upper()]},
+        ], format='json')
+        assert response.status_code == HTTPStatus.OK, (
+            'Повторяющиеся жанры элемента не должны приводить к ошибке '
+            'сервера.'
+        )
+        assert [genre['slug'] for genre in response.json()[0]['genre']] == [
+            slug
+        ]
+
+    def test_05_bulk_insert_path(self, admin_client):
+        from reviews.models import Title, TitleScoreHistogram
+
+        titles, categories, genres = create_titles(admin_client)
+        Title.objects.filter(pk=titles[-1]['id']).delete()
+        data = [
+            {'name': f'Пакет {idx}', 'year': 2000,
+             'category': categories[0]['slug'],
+             'genre': [genres[0]['slug'], genres[0]['slug']]}
+            for idx in range(10)
+        ]
+        response = admin_client.post(self.URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()
+        ids = [result['id'] for result in results]
+        assert [result['name'] for result in results] == [
+            item['name'] for item in data
+        ]
+        assert dict(Title.objects.filter(pk__in=ids).values_list(
+            'pk', 'name'
+        )) == dict(zip(ids, (item['name'] for item in data))), (
+            'Id, полученные после bulk_create, должны соответствовать '
+            'вставленным произведениям.'
+        )
+        assert min(ids) > titles[-1]['id']
+        assert TitleScoreHistogram.objects.filter(
+            title_id__in=ids
+        ).count() == len(ids)
+
+    def test_06_repeated_id(self, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        item = {'id': titles[0]['id'], 'genre': [genres[0]['slug']]}
+        response = admin_client.post(
+            self.URL, data=[item, dict(item, name='Повтор'), item],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Повторный id в пакете не должен приводить к ошибке сервера.'
+        )
+        results = response.json()
+        assert results[0]['id'] == titles[0]['id']
+        assert 'id' in results[1]['errors'] and 'id' in results[2]['errors']
+        assert admin_client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/'
+        ).json()['name'] == titles[0]['name']
@@ -0,0 +1,59 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17ResponseCache:
+
+    def test_01_anonymous_list_is_cached(self, client, admin_client):
+        create_titles(admin_client)
+        url = '/api/v1/titles/?genre=drama&limit=5'
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        with CaptureQueriesContext(connection) as context:
+            cached = client.get('/api/v1/titles/?limit=5&genre=drama')
+        assert cached['X-Cache'] == 'HIT', (
+            'Повторный анонимный запрос с теми же параметрами в другом '
+            'порядке должен обслуживаться из кеша.'
+        )
+        assert not context.captured_queries
+        assert cached.json() == response.json()
+
+        response = admin_client.get(url)
+        assert not response.has_header('X-Cache'), (
+            'Ответы авторизованным пользователям не должны кешироваться.'
+        )
+
+    def test_02_review_invalidates_titles(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert client.get(url).json()['rating'] is None
+        assert client.get(url)['X-Cache'] == 'HIT'
+
+        create_single_review(admin_client, titles[0]['id'], 'Отзыв', 6)
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS', (
+            'Запись отзыва должна сбрасывать кеш ответов произведений.'
+        )
+        assert response.json()['rating'] == 6
+
+    def test_03_category_write_invalidates(self, client, admin_client):
+        create_titles(admin_client)
+        assert client.get('/api/v1/categories/').json()['count'] == 2
+        admin_client.delete('/api/v1/categories/books/')
+        response = client.get('/api/v1/categories/')
+        assert response.json()['count'] == 1
+
+    def test_04_cache_stats(self, client, admin_client, user_client):
+        client.get('/api/v1/genres/')
+        client.get('/api/v1/genres/')
+        url = '/api/v1/_stats/cache/'
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['genres'] == {'hit': 1, 'miss': 1}
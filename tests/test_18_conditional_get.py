@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18ConditionalGet:
+
+    def assert_not_modified(self, client, url, etag):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'GET-запрос к `{url}` с актуальным ETag должен возвращать '
+            'ответ со статусом 304.'
+        )
+        assert len(context.captured_queries) == 1
+
+    def test_01_title_detail(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response = client.get(url)
+        etag = response['ETag']
+        assert response.has_header('Last-Modified')
+        self.assert_not_modified(client, url, etag)
+
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 9)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'После добавления отзыва ETag произведения должен меняться.'
+        )
+        assert response.json()['rating'] == 9
+        etag = response['ETag']
+
+        admin_client.patch(url, data={'description': 'Новое описание'})
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == (
+            HTTPStatus.OK
+        ), 'После изменения произведения ETag должен меняться.'
+
+    def test_02_review_thread(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(
+            user_client, titles[0]['id'], 'Отзыв', 5
+        ).json()
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = client.get(url)['ETag']
+        self.assert_not_modified(client, url, etag)
+        assert client.get(f'{url}?limit=1')['ETag'] != etag, (
+            'ETag должен зависеть от параметров запроса.'
+        )
+
+        user_client.patch(f'{url}{review["id"]}/', data={'text': 'Правка'})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'После изменения отзыва ETag списка отзывов должен меняться.'
+        )
+        assert response.json()['results'][0]['text'] == 'Правка'
+
+    def test_03_genre_change(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[1]["id"]}/'
+        etag = client.get(url)['ETag']
+        admin_client.delete('/api/v1/genres/drama/')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['genre'] == []
+
+    def test_04_non_numeric_title_id(self, client, user_client):
+        for url in ('/api/v1/titles/abc/', '/api/v1/titles/abc/stats/'):
+            for api_client in (client, user_client):
+                assert api_client.get(url).status_code == (
+                    HTTPStatus.NOT_FOUND
+                ), f'GET-запрос к `{url}` должен возвращать ответ 404.'
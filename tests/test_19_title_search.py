@@ -0,0 +1,81 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19TitleSearch:
+
+    URL = '/api/v1/titles/'
+
+    def search(self, client, text):
+        response = client.get(self.URL, {'search': text})
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_name_and_description(self, client, admin_client):
+        create_titles(admin_client)
+        assert self.search(client, 'терминатор') == ['Терминатор'], (
+            'Поиск должен находить произведения по названию без учёта '
+            'регистра.'
+        )
+        assert self.search(client, 'yippie') == ['Крепкий орешек'], (
+            'Поиск должен находить произведения по описанию.'
+        )
+        assert self.search(client, 'орешек back') == []
+        assert self.search(client, '"*(') == []
+
+    def test_02_index_follows_writes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.URL}{titles[0]["id"]}/'
+        admin_client.patch(url, data={'name': 'Хищник'})
+        assert self.search(client, 'терминатор') == []
+        assert self.search(client, 'хищник') == ['Хищник']
+        admin_client.delete(url)
+        assert self.search(client, 'хищник') == []
+
+    def test_03_search_ranking(self, client, admin_client):
+        from reviews.models import Title
+
+        Title.objects.create(
+            name='Гамлет', year=1600,
+            description='Трагедия. Призрак, призрак и снова призрак.'
+        )
+        Title.objects.create(
+            name='Макбет', year=1606, description='Трагедия и призрак.'
+        )
+        assert self.search(client, 'призрак') == ['Гамлет', 'Макбет'], (
+            'Результаты поиска должны быть отсортированы по релевантности.'
+        )
+
+    def test_04_rebuild_search_index(self, client, admin_client):
+        from django.core.management import call_command
+
+        create_titles(admin_client)
+        call_command('rebuild_search_index')
+        assert self.search(client, 'терминатор') == ['Терминатор']
+
+    def test_05_triggers_restored_after_migrate(self, client, admin_client):
+        from django.core.management import call_command
+        from django.db import connection
+
+        if connection.vendor != 'sqlite':
+            pytest.skip('Триггеры FTS5 используются только на SQLite.')
+        titles, _, _ = create_titles(admin_client)
+        with connection.cursor() as cursor:
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(
+                    f'DROP TRIGGER reviews_title_fts_{suffix}'
+                )
+        admin_client.patch(f'{self.URL}{titles[0]["id"]}/',
+                           data={'name': 'Хищник'})
+        call_command('migrate', verbosity=0)
+        assert self.search(client, 'хищник') == ['Хищник'], (
+            'После migrate триггеры индекса поиска должны восстанавливаться '
+            'вместе с содержимым индекса.'
+        )
+        admin_client.patch(f'{self.URL}{titles[0]["id"]}/',
+                           data={'name': 'Чужой'})
+        assert self.search(client, 'чужой') == ['Чужой']
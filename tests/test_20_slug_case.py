@@ -0,0 +1,53 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20SlugCase:
+
+    CATEGORY_URL = '/api/v1/categories/'
+    GENRE_URL = '/api/v1/genres/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_slug_stored_lowercase(self, admin_client):
+        response = admin_client.post(
+            self.CATEGORY_URL, data={'name': 'Кино', 'slug': 'Movie'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['slug'] == 'movie', (
+            'Слаг категории должен сохраняться в нижнем регистре.'
+        )
+        response = admin_client.post(
+            self.CATEGORY_URL, data={'name': 'Фильмы', 'slug': 'MOVIE'}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Слаги, отличающиеся только регистром, должны считаться '
+            'одинаковыми.'
+        )
+
+    def test_02_slug_lookups_ignore_case(self, admin_client):
+        categories = create_categories(admin_client)
+        genres = create_genre(admin_client)
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Поворот',
+            'year': 2000,
+            'genre': [genres[0]['slug'].upper()],
+            'category': categories[0]['slug'].upper(),
+        })
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Жанр и категория произведения должны находиться по слагу без '
+            'учёта регистра.'
+        )
+        response = admin_client.get(
+            self.TITLES_URL, {'genre': genres[0]['slug'].upper()}
+        )
+        assert response.json()['count'] == 1, (
+            'Фильтр по жанру должен работать без учёта регистра.'
+        )
+        response = admin_client.delete(
+            f'{self.GENRE_URL}{genres[1]["slug"].upper()}/'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
@@ -0,0 +1,39 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21GenreFilter:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_genre_filter_uses_subquery(self, client):
+        from reviews.models import Category, Genre, Title
+
+        category = Category.objects.create(name='Книги', slug='books')
+        genres = [
+            Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+            for idx in range(3)
+        ]
+        for idx in range(5):
+            title = Title.objects.create(
+                name=f'Произведение {idx}', year=2000, category=category
+            )
+            title.genre.set(genres)
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.TITLES_URL, {'genre': 'Genre-1'})
+        data = response.json()
+        assert data['count'] == 5 and len(data['results']) == 5, (
+            'Произведение с несколькими жанрами должно попадать в выдачу '
+            'фильтра по жанру ровно один раз.'
+        )
+        sql = ' '.join(
+            query['sql'] for query in context.captured_queries
+            if 'reviews_title_genre' in query['sql']
+        ).upper()
+        assert 'EXISTS' in sql and 'DISTINCT' not in sql, (
+            'Фильтр по жанру должен строиться как EXISTS-подзапрос к '
+            'промежуточной таблице.'
+        )
@@ -0,0 +1,105 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.fixture
+def request_stats(settings):
+    from api import stats
+
+    settings.REQUEST_STATS_ENABLED = True
+    settings.REQUEST_STATS_SAMPLE_RATE = 1.0
+    stats.reset()
+    yield stats
+    stats.reset()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22RequestStats:
+
+    STATS_URL = '/api/v1/_stats/'
+
+    def test_01_stats_per_action(self, request_stats, client, admin_client):
+        create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+        response = admin_client.get(self.STATS_URL)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert 'TitleViewSet.create' in data
+        title_list = data.get('TitleViewSet.list')
+        assert title_list and title_list['wall_seconds']['count'] == 2, (
+            'Статистика должна собираться по представлению и действию.'
+        )
+        assert title_list['queries']['max'] >= 1
+        assert title_list['db_seconds']['sum'] > 0
+
+    def test_02_prometheus_format(self, request_stats, client, admin_client):
+        client.get('/api/v1/genres/')
+        response = admin_client.get(self.STATS_URL, {'format': 'prometheus'})
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/plain')
+        body = response.content.decode()
+        assert (
+            'yamdb_request_queries_count{endpoint="GenreViewSet.list"} 1'
+            in body
+        )
+        assert '# TYPE yamdb_request_wall_seconds histogram' in body
+
+    def test_03_sampling_and_permissions(self, request_stats, settings,
+                                         client, user_client):
+        settings.REQUEST_STATS_SAMPLE_RATE = 0
+        client.get('/api/v1/genres/')
+        assert request_stats.get_stats() == {}
+        assert client.get(self.STATS_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        response = client.get(self.STATS_URL, {'format': 'prometheus'})
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Ошибки доступа должны отдаваться и в формате Prometheus.'
+        )
+        assert 'detail' in response.content.decode()
+        assert user_client.get(self.STATS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+
+    def test_04_serializer_time(self, request_stats, settings, monkeypatch,
+                                admin_client):
+        import time
+
+        from rest_framework import serializers
+
+        from api.serializers import TitleReadSerializer
+
+        assert settings.MIDDLEWARE[0] == (
+            'api.middleware.RequestStatsMiddleware'
+        ), 'Сбор статистики должен охватывать остальные промежуточные слои.'
+        titles, _, _ = create_titles(admin_client)
+        to_representation = serializers.Serializer.to_representation
+        flat_representation = TitleReadSerializer.flat_representation.__func__
+
+        def slow_representation(self, instance):
+            time.sleep(0.05)
+            return to_representation(self, instance)
+
+        def slow_flat_representation(cls, rows):
+            time.sleep(0.05)
+            return flat_representation(cls, rows)
+
+        monkeypatch.setattr(serializers.Serializer, 'to_representation',
+                            slow_representation)
+        monkeypatch.setattr(TitleReadSerializer, 'flat_representation',
+                            classmethod(slow_flat_representation))
+        admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        settings.FLAT_LIST_SERIALIZERS = True
+        admin_client.get('/api/v1/titles/')
+        data = request_stats.get_stats()
+        for endpoint in ('TitleViewSet.retrieve', 'TitleViewSet.list'):
+            serialization = data[endpoint]['serialization_seconds']['sum']
+            assert serialization >= 0.05, (
+                'Время сериализации должно включать работу сериализатора: '
+                f'{endpoint}.'
+            )
+            assert data[endpoint]['wall_seconds']['sum'] >= serialization
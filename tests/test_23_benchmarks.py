@@ -0,0 +1,31 @@
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23Benchmarks:
+
+    def test_01_seed_and_scenarios(self):
+        from benchmarks.scenarios import SCENARIOS, Context
+        from benchmarks.seed import Scale, seed
+        from reviews.models import Comments, Review, Title
+
+        scale = Scale(titles=6, users=4, reviews_per_title=3,
+                      comments_per_review=2)
+        seed(scale, batch_size=5)
+        assert Title.objects.count() == 6
+        assert Review.objects.count() == 18
+        assert Comments.objects.count() == 36
+        stored = list(Title.objects.order_by('pk').values_list(
+            'rating_sum', 'rating_count'
+        ))
+        Title.objects.recalculate_rating()
+        assert stored == list(Title.objects.order_by('pk').values_list(
+            'rating_sum', 'rating_count'
+        )), 'Рейтинг синтетических произведений должен совпадать с отзывами.'
+
+        context = Context(scale)
+        for name, scenario in SCENARIOS.items():
+            response = scenario(context)
+            assert response.status_code < 400, (
+                f'Сценарий `{name}` завершился ошибкой: {response.content}'
+            )
@@ -0,0 +1,46 @@
+import pytest
+from django.db import connection
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Database:
+
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_01_sqlite_pragmas_applied(self, settings):
+        assert self.pragma('synchronous') == 1, (
+            'Соединение SQLite должно открываться с synchronous=NORMAL.'
+        )
+        assert self.pragma('busy_timeout') == (
+            settings.SQLITE_PRAGMAS['busy_timeout']
+        )
+
+    def test_02_health_check_on_request_start(self, client,
+                                                      monkeypatch):
+        connection.ensure_connection()
+        monkeypatch.setitem(connection.settings_dict,
+                            'CONN_HEALTH_CHECKS', True)
+        monkeypatch.setattr(connection, 'is_usable', lambda: False)
+        client.get('/api/v1/genres/')
+        monkeypatch.undo()
+        assert client.get('/api/v1/genres/').status_code == 200, (
+            'Неработоспособное соединение должно закрываться в начале '
+            'запроса и открываться заново.'
+        )
+
+    def test_03_health_check_keeps_usable_connection(self, monkeypatch):
+        from api.database import check_connections
+
+        closed = []
+        connection.ensure_connection()
+        monkeypatch.setitem(connection.settings_dict,
+                            'CONN_HEALTH_CHECKS', True)
+        monkeypatch.setattr(connection, 'close', lambda: closed.append(1))
+        check_connections()
+        assert not closed, 'Рабочее соединение не должно закрываться.'
+        monkeypatch.setattr(connection, 'is_usable', lambda: False)
+        check_connections()
+        assert closed, 'Неработоспособное соединение должно закрываться.'
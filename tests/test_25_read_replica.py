@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+
+from tests.utils import create_titles
+
+REPLICA = 'replica'
+
+
+@pytest.fixture
+def replica(settings, tmp_path):
+    """Отдельная база SQLite в роли реплики без репликации данных."""
+
+    connections.databases[REPLICA] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+    }
+    connections.ensure_defaults(REPLICA)
+    connections.prepare_test_settings(REPLICA)
+    call_command('migrate', database=REPLICA, verbosity=0)
+    settings.DATABASE_REPLICAS = [REPLICA]
+    yield REPLICA
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.databases[REPLICA]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25ReadReplica:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_reads_routed_to_replica(self, replica, admin_client,
+                                        user_client):
+        create_titles(admin_client)
+        response = user_client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 0, (
+            'GET-запросы к списку произведений должны читать с реплики.'
+        )
+        assert user_client.get('/api/v1/genres/').json()['count'] == 0, (
+            'GET-запросы к жанрам должны читать с реплики.'
+        )
+
+    def test_02_read_your_writes(self, replica, admin_client):
+        create_titles(admin_client)
+        assert admin_client.get(self.TITLES_URL).json()['count'] == 2, (
+            'После записи пользователь должен читать из основной базы.'
+        )
+        cache.clear()
+        assert admin_client.get(self.TITLES_URL).json()['count'] == 0, (
+            'По истечении окна после записи чтение должно вернуться на '
+            'реплику.'
+        )
+
+    def test_03_no_replicas_configured(self, admin_client, user_client):
+        create_titles(admin_client)
+        cache.clear()
+        assert user_client.get(self.TITLES_URL).json()['count'] == 2
+
+    def test_04_count_cache_per_database(self, replica, admin_client,
+                                         user_client):
+        create_titles(admin_client)
+        assert user_client.get(self.TITLES_URL).json()['count'] == 0
+        response = admin_client.get(self.TITLES_URL).json()
+        assert response['count'] == 2 and len(response['results']) == 2, (
+            'Количество, закешированное при чтении с реплики, не должно '
+            'использоваться при чтении из основной базы.'
+        )
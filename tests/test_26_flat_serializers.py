@@ -0,0 +1,75 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONRenderer
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26FlatSerializers:
+
+    URLS = (
+        '/api/v1/titles/',
+        '/api/v1/titles/?genre=drama',
+        '/api/v1/titles/{title_id}/reviews/',
+        '/api/v1/titles/{title_id}/reviews/?limit=1&cursor=',
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+    )
+
+    def test_01_flat_list_matches_serializer(self, settings, admin_client,
+                                             user_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review = create_single_review(
+            admin_client, title_id, 'Отзыв \u2028 с разделителем', 7
+        ).json()
+        create_single_review(user_client, title_id, 'Второй отзыв', 4)
+        admin_client.post(
+            f'/api/v1/titles/{title_id}/reviews/{review["id"]}/comments/',
+            data={'text': 'Комментарий'}
+        )
+        Title.objects.filter(pk=titles[1]['id']).update(category=None)
+
+        for url in self.URLS:
+            url = url.format(title_id=title_id, review_id=review['id'])
+            settings.FLAT_LIST_SERIALIZERS = False
+            expected = admin_client.get(url).content
+            settings.FLAT_LIST_SERIALIZERS = True
+            assert admin_client.get(url).content == expected, (
+                f'Список `{url}` из .values() должен совпадать побайтово '
+                'с выводом сериализатора.'
+            )
+
+    def test_02_fast_renderer_matches_json_renderer(self):
+        data = {
+            'count': 1,
+            'results': [{
+                'name': 'Юникод \u2029 и "кавычки"',
+                'rating': None,
+                'genre': [{'slug': 'drama'}],
+                1: 2,
+            }],
+        }
+        assert FastJSONRenderer().render(data) == (
+            JSONRenderer().render(data)
+        )
+
+    def test_03_fast_renderer_floats_and_datetimes(self):
+        from datetime import date, datetime, time, timezone
+
+        payloads = [
+            {'db_seconds': 1.2e-05, 'big': 1e16, 'mean': 7.5},
+            {'created': datetime(2024, 1, 2, 3, 4, 5, 678000,
+                                 tzinfo=timezone.utc),
+             'day': date(2024, 1, 2), 'at': time(3, 4, 5)},
+            [{'id': 1, 'pub_date': datetime(2024, 1, 2, tzinfo=timezone.utc),
+              'score': 0.1}],
+        ]
+        for data in payloads:
+            assert FastJSONRenderer().render(data) == (
+                JSONRenderer().render(data)
+            ), f'Вывод FastJSONRenderer должен совпадать для {data!r}.'
+        with pytest.raises(ValueError):
+            FastJSONRenderer().render({'mean': float('nan')})
@@ -0,0 +1,59 @@
+import gzip
+
+import pytest
+from django.core.management import call_command
+
+from api.compression import choose_encoding
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27Compression:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_list_compressed_above_threshold(self, settings, client,
+                                                admin_client):
+        settings.RESPONSE_COMPRESSION_MIN_LENGTH = 100
+        create_titles(admin_client)
+        plain = client.get(self.TITLES_URL)
+        assert 'Content-Encoding' not in plain, (
+            'Без Accept-Encoding ответ не должен сжиматься.'
+        )
+        response = client.get(self.TITLES_URL, HTTP_ACCEPT_ENCODING='gzip')
+        assert response['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response['Vary']
+        assert gzip.decompress(response.content) == plain.content
+
+        settings.RESPONSE_COMPRESSION_MIN_LENGTH = 100000
+        response = client.get(self.TITLES_URL, HTTP_ACCEPT_ENCODING='gzip')
+        assert 'Content-Encoding' not in response, (
+            'Ответ короче порога не должен сжиматься.'
+        )
+
+    def test_02_endpoint_settings(self, settings, client, admin_client):
+        settings.RESPONSE_COMPRESSION_MIN_LENGTH = 100
+        settings.RESPONSE_COMPRESSION_ENDPOINTS = {'TitleViewSet.list': None}
+        create_titles(admin_client)
+        response = client.get(self.TITLES_URL, HTTP_ACCEPT_ENCODING='gzip')
+        assert 'Content-Encoding' not in response, (
+            'Сжатие должно отключаться для отдельного эндпоинта.'
+        )
+
+    def test_03_streaming_export(self, admin_client):
+        call_command('import_csv')
+        url = '/api/v1/export/review.csv'
+        plain = b''.join(admin_client.get(url).streaming_content)
+        response = admin_client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        assert response.streaming
+        assert response['Content-Encoding'] == 'gzip'
+        compressed = b''.join(response.streaming_content)
+        assert gzip.decompress(compressed) == plain
+        assert len(compressed) < len(plain)
+
+    def test_04_negotiation(self):
+        assert choose_encoding('') is None
+        assert choose_encoding('identity') is None
+        assert choose_encoding('gzip;q=0, deflate') is None
+        assert choose_encoding('deflate, gzip;q=0.5') == 'gzip'
+        assert choose_encoding('*') in ('br', 'gzip')
@@ -0,0 +1,148 @@
+import random
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+def read_boards():
+    from reviews.models import LeaderboardEntry
+
+    boards = {}
+    for entry in LeaderboardEntry.objects.order_by('position'):
+        boards.setdefault(
+            (entry.scope, entry.scope_id, entry.metric), []
+        ).append((entry.title_id, entry.value))
+    return boards
+
+
+def expected_boards():
+    from reviews import leaderboard
+    from reviews.models import Category, Genre
+
+    scopes = [('all', 0)]
+    scopes += [('category', pk) for pk in
+               Category.objects.values_list('pk', flat=True)]
+    scopes += [('genre', pk) for pk in
+               Genre.objects.values_list('pk', flat=True)]
+    boards = {}
+    for scope, scope_id in scopes:
+        for metric in leaderboard.METRIC_FIELDS:
+            items = leaderboard.select_top(scope, scope_id, metric)
+            if items:
+                boards[scope, scope_id, metric] = items
+    return boards
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28Leaderboard:
+
+    TITLES_URL = '/api/v1/titles/'
+    TOP_URL = '/api/v1/titles/top/'
+
+    def test_01_ordering(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(admin_client, titles[1]['id'], 'Отзыв', 9)
+        create_single_review(user_client, titles[1]['id'], 'Отзыв', 7)
+        create_single_review(admin_client, titles[0]['id'], 'Отзыв', 10)
+        response = user_client.get(self.TITLES_URL, {'ordering': '-rating'})
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[0]['id'], titles[1]['id']
+        ], 'Произведения должны сортироваться по убыванию рейтинга.'
+        response = user_client.get(
+            self.TITLES_URL, {'ordering': '-review_count'}
+        )
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[1]['id'], titles[0]['id']
+        ], 'Произведения должны сортироваться по количеству отзывов.'
+
+    def test_02_top_endpoint(self, admin_client, user_client):
+        titles, categories, genres = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        create_single_review(user_client, first, 'Отзыв', 4)
+        review = create_single_review(admin_client, second, 'Отзыв', 8)
+
+        response = user_client.get(self.TOP_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert [title['id'] for title in response.json()] == [
+            second, first
+        ]
+        admin_client.patch(
+            f'{self.TITLES_URL}{second}/reviews/{review.json()["id"]}/',
+            data={'score': 2}
+        )
+        assert [title['id'] for title in user_client.get(
+            self.TOP_URL
+        ).json()] == [first, second], (
+            'Рейтинг лучших должен обновляться при изменении оценки.'
+        )
+
+        genre = genres[2]['slug']
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(self.TOP_URL, {'genre': genre})
+        assert [title['id'] for title in response.json()] == [second]
+        assert len(context.captured_queries) <= 3
+
+        response = user_client.get(
+            self.TOP_URL,
+            {'category': categories[0]['slug'], 'metric': 'review_count'}
+        )
+        assert [title['id'] for title in response.json()] == [first]
+        assert user_client.get(
+            self.TOP_URL, {'metric': 'unknown'}
+        ).status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_incremental_matches_rebuild(self, settings,
+                                            django_user_model):
+        from reviews.models import Category, Genre, Review, Title
+
+        settings.LEADERBOARD_SIZE = 2
+        rng = random.Random(1)
+        categories = [
+            Category.objects.create(name=f'Категория {idx}',
+                                    slug=f'category-{idx}')
+            for idx in range(2)
+        ]
+        genres = [
+            Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+            for idx in range(2)
+        ]
+        titles = []
+        for idx in range(5):
+            title = Title.objects.create(
+                name=f'Произведение {idx}', year=2000,
+                category=categories[idx % 2]
+            )
+            title.genre.set(genres[:idx % 2 + 1])
+            titles.append(title)
+        authors = [
+            django_user_model.objects.create(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            for idx in range(4)
+        ]
+        for step in range(60):
+            title, author = rng.choice(titles), rng.choice(authors)
+            review = Review.objects.filter(title=title, author=author).first()
+            if review is None:
+                Review.objects.create(title=title, author=author, text='-',
+                                      score=rng.randint(1, 10))
+            elif rng.random() < 0.5:
+                review.delete()
+            else:
+                review.score = rng.randint(1, 10)
+                review.save()
+            if step == 30:
+                titles[0].refresh_from_db()
+                titles[0].category = categories[1]
+                titles[0].save()
+                titles[1].genre.clear()
+            assert read_boards() == expected_boards(), (
+                'Инкрементальное обновление рейтингов лучших должно давать '
+                'тот же результат, что и полная пересборка.'
+            )
+        titles[2].delete()
+        assert read_boards() == expected_boards()
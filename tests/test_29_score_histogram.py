@@ -0,0 +1,113 @@
+import random
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+def read_histograms():
+    from reviews.models import TitleScoreHistogram
+
+    return {row.title_id: row.distribution
+            for row in TitleScoreHistogram.objects.all()}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29ScoreHistogram:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_stats_endpoint(self, admin_client, user_client,
+                               moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'{self.TITLES_URL}{title_id}/stats/'
+
+        response = user_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 0
+        assert response.json()['mean'] is None
+
+        create_single_review(admin_client, title_id, 'Отзыв', 10)
+        create_single_review(user_client, title_id, 'Отзыв', 4)
+        review = create_single_review(moderator_client, title_id, 'Отзыв', 7)
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(url)
+        data = response.json()
+        assert data['count'] == 3
+        assert data['mean'] == 7
+        assert data['median'] == 7
+        assert data['distribution']['10'] == 1, (
+            'Распределение должно содержать количество каждой оценки.'
+        )
+        assert not any(
+            'reviews_review' in query['sql']
+            for query in context.captured_queries
+        ), 'Статистика не должна читать таблицу отзывов.'
+
+        moderator_client.patch(
+            f'{url[:-len("stats/")]}reviews/{review.json()["id"]}/',
+            data={'score': 5}
+        )
+        data = user_client.get(url).json()
+        assert data['median'] == 5
+        assert data['distribution']['7'] == 0
+        assert data['distribution']['5'] == 1
+
+        moderator_client.delete(
+            f'{url[:-len("stats/")]}reviews/{review.json()["id"]}/'
+        )
+        data = user_client.get(url).json()
+        assert data['count'] == 2
+        assert data['median'] == 7, (
+            'Медиана чётного количества оценок — среднее двух центральных.'
+        )
+
+        assert user_client.get(
+            f'{self.TITLES_URL}9999/stats/'
+        ).status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_incremental_matches_rebuild(self, django_user_model):
+        from reviews import histogram
+        from reviews.models import Category, Review, Title
+
+        rng = random.Random(2)
+        category = Category.objects.create(name='Категория', slug='category')
+        titles = [
+            Title.objects.create(name=f'Произведение {idx}', year=2000,
+                                 category=category)
+            for idx in range(3)
+        ]
+        authors = [
+            django_user_model.objects.create(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            for idx in range(4)
+        ]
+        for _ in range(40):
+            title, author = rng.choice(titles), rng.choice(authors)
+            review = Review.objects.filter(title=title, author=author).first()
+            if review is None:
+                Review.objects.create(title=title, author=author, text='-',
+                                      score=rng.randint(1, 10))
+            elif rng.random() < 0.5:
+                review.delete()
+            else:
+                review.score = rng.randint(1, 10)
+                review.save()
+        incremental = read_histograms()
+        histogram.rebuild()
+        assert read_histograms() == incremental, (
+            'Инкрементальное обновление распределения должно давать тот же '
+            'результат, что и пересчёт по отзывам.'
+        )
+
+        Review.objects.filter(title=titles[0]).update(score=1)
+        call_command('recalculate_ratings')
+        assert read_histograms()[titles[0].pk][1] == Review.objects.filter(
+            title=titles[0]
+        ).count(), 'recalculate_ratings должна пересчитывать распределения.'